@@ -0,0 +1,145 @@
+"""End to end benchmarks of the Wall Pad gateway against the simulator."""
+
+from __future__ import annotations
+
+import asyncio
+import statistics
+import time
+
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from conftest import RESULTS
+from custom_components.imazu_wall_pad.const import (
+    CONF_OPTIMISTIC,
+    CONF_SEND_INTERVAL,
+    DEFAULT_SEND_INTERVAL,
+    DOMAIN,
+)
+from homeassistant.const import CONF_HOST, CONF_PORT, STATE_OFF, STATE_ON
+from homeassistant.core import Event, EventStateChangedData, HomeAssistant
+from homeassistant.helpers import entity_registry as er
+from simulator import SimulatorConfig
+
+# A benchmark gives up after DISCOVERY_TIMEOUT + COMMAND_COUNT * COMMAND_TIMEOUT
+# seconds at most, the whole run usually takes about a minute and a half.
+DISCOVERY_TIMEOUT = 60
+COMMAND_TIMEOUT = 5
+COMMAND_COUNT = 20
+
+APARTMENTS = {
+    "studio": SimulatorConfig(rooms=1, lights=2, outlets=1, seed=1),
+    "family": SimulatorConfig(rooms=4, lights=2, outlets=2, seed=1),
+    "large": SimulatorConfig(rooms=6, lights=4, dimmers=1, outlets=3, seed=1),
+}
+
+
+def _percentile(samples: list[float], percentile: int) -> float:
+    """Return a percentile of the samples in milliseconds."""
+    samples = sorted(samples)
+    index = min(len(samples) - 1, len(samples) * percentile // 100)
+    return round(samples[index] * 1000, 1)
+
+
+def _discovered(hass: HomeAssistant, entry: MockConfigEntry) -> int:
+    """Return the number of wall pad devices with an entity."""
+    return len(
+        {
+            entity.unique_id
+            for entity in er.async_entries_for_config_entry(
+                er.async_get(hass), entry.entry_id
+            )
+            if entity.domain != "sensor"
+        }
+    )
+
+
+def _wait_state(
+    hass: HomeAssistant, entity_id: str, state: str
+) -> asyncio.Future[None]:
+    """Return a future done when the entity reaches a state."""
+    future: asyncio.Future[None] = hass.loop.create_future()
+
+    def _state_changed(event: Event[EventStateChangedData]) -> None:
+        new_state = event.data["new_state"]
+        if (
+            event.data["entity_id"] == entity_id
+            and new_state is not None
+            and new_state.state == state
+            and not future.done()
+        ):
+            future.set_result(None)
+
+    unsub = hass.bus.async_listen("state_changed", _state_changed)
+    future.add_done_callback(lambda _: unsub())
+    return future
+
+
+@pytest.mark.parametrize("apartment", APARTMENTS)
+@pytest.mark.parametrize("send_interval", [DEFAULT_SEND_INTERVAL, 100])
+async def test_gateway(
+    hass: HomeAssistant, start_simulator, apartment: str, send_interval: int
+) -> None:
+    """Measure setup, discovery and command latency of an apartment."""
+    simulator = await start_simulator(APARTMENTS[apartment])
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={CONF_HOST: "127.0.0.1", CONF_PORT: simulator.port},
+        # The state is only written once the status packet confirms it.
+        options={CONF_SEND_INTERVAL: send_interval, CONF_OPTIMISTIC: False},
+    )
+    entry.add_to_hass(hass)
+
+    started = time.monotonic()
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    setup_time = time.monotonic() - started
+
+    try:
+        while _discovered(hass, entry) < simulator.device_count:
+            assert time.monotonic() - started < DISCOVERY_TIMEOUT, "discovery timed out"
+            await asyncio.sleep(0.05)
+        discovery_time = time.monotonic() - started
+
+        # Fans are answered with a multi status packet, unlike the lights.
+        devices = sorted(
+            entity_id
+            for entity_id in hass.states.async_entity_ids(("light", "fan"))
+            if hass.states.get(entity_id).state in (STATE_ON, STATE_OFF)
+        )
+        latencies: list[float] = []
+        lost = 0
+        for index in range(COMMAND_COUNT):
+            entity_id = devices[index % len(devices)]
+            state = hass.states.get(entity_id).state
+            target = STATE_OFF if state == STATE_ON else STATE_ON
+            confirmed = _wait_state(hass, entity_id, target)
+            sent = time.monotonic()
+            await hass.services.async_call(
+                entity_id.split(".")[0], f"turn_{target}", {"entity_id": entity_id}
+            )
+            try:
+                await asyncio.wait_for(confirmed, COMMAND_TIMEOUT)
+            except TimeoutError:
+                lost += 1
+                continue
+            latencies.append(time.monotonic() - sent)
+        assert latencies, "no command was confirmed"
+
+        metrics = entry.runtime_data.metrics
+        RESULTS[f"{apartment} send_interval={send_interval}ms"] = {
+            "devices": simulator.device_count,
+            "setup_time_ms": round(setup_time * 1000, 1),
+            "discovery_time_ms": round(discovery_time * 1000, 1),
+            "command_p50_ms": _percentile(latencies, 50),
+            "command_p95_ms": _percentile(latencies, 95),
+            "command_max_ms": _percentile(latencies, 100),
+            "command_mean_ms": round(statistics.fmean(latencies) * 1000, 1),
+            "commands_lost": lost,
+            "round_trip_p50_ms": metrics.round_trip_percentile(50),
+            "retries": metrics.retries,
+            "frames_sent": metrics.frames_sent,
+            "frames_received": metrics.frames_received,
+        }
+    finally:
+        assert await hass.config_entries.async_unload(entry.entry_id)
+        await hass.async_block_till_done()
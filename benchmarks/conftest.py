@@ -0,0 +1,52 @@
+"""Fixtures of the Wall Pad benchmarks."""
+
+from __future__ import annotations
+
+import sys
+from collections.abc import AsyncGenerator, Awaitable, Callable
+from pathlib import Path
+
+import pytest
+
+from simulator import SimulatorConfig, WallPadSimulator
+
+sys.path.insert(0, str(Path(__file__).parents[1]))
+
+pytest_plugins = "pytest_homeassistant_custom_component"
+
+RESULTS: dict[str, dict[str, float | int | None]] = {}
+
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(enable_custom_integrations):
+    """Load the integration from custom_components."""
+    yield
+
+
+@pytest.fixture
+async def start_simulator(socket_enabled) -> AsyncGenerator[
+    Callable[[SimulatorConfig], Awaitable[WallPadSimulator]]
+]:
+    """Return a factory starting simulators, stopped after the benchmark."""
+    simulators: list[WallPadSimulator] = []
+
+    async def _start(config: SimulatorConfig) -> WallPadSimulator:
+        simulator = WallPadSimulator(config)
+        await simulator.async_start()
+        simulators.append(simulator)
+        return simulator
+
+    yield _start
+    for simulator in simulators:
+        await simulator.async_stop()
+
+
+def pytest_terminal_summary(terminalreporter) -> None:
+    """Print the measured numbers of every benchmark."""
+    if not RESULTS:
+        return
+    terminalreporter.section("imazu wall pad benchmarks")
+    for name, values in RESULTS.items():
+        terminalreporter.write_line(name)
+        for key, value in values.items():
+            terminalreporter.write_line(f"  {key:<24} {value}")
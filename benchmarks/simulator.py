@@ -0,0 +1,343 @@
+"""EW11 and Imazu wall pad simulator.
+
+Serves the wall pad side of the RS485 bus over TCP, the way an EW11 in TCP
+server mode does. It answers the scan and change packets the integration sends
+and can report device states on its own, like a busy apartment bus.
+
+    python benchmarks/simulator.py --rooms 4 --port 8899
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import random
+from dataclasses import dataclass, field
+
+from wp_imazu.client import checksum, makesum
+
+_LOGGER = logging.getLogger(__name__)
+
+LIGHT = 0x19
+DIMMING = 0x1A
+GAS = 0x1B
+OUTLET = 0x1F
+FAN = 0x2B
+THERMOSTAT = 0x18
+
+SCAN = 0x01
+CHANGE = 0x02
+STATUS = 0x04
+
+BOOL = 0x40
+MULTI = 0x41
+DIM = 0x42
+VALVE = 0x43
+TEMP = 0x45
+MODE = 0x46
+
+POWER_ON = 0x01
+POWER_OFF = 0x02
+THERMOSTAT_HEAT = 0x01
+
+# Dimming level to the state byte of a room scan and of a single device
+_DIM_ROOM = (0x00, 0x01, 0x04, 0x07)
+_DIM_DEVICE = (0x02, 0x01, 0x03, 0x06)
+_DIM_CHANGE = {0x01: 1, 0x03: 2, 0x06: 3}
+
+
+def make_frame(body: bytes | bytearray) -> bytes:
+    """Wrap a packet body (01 or 1a, device, cmd, value_type, sub, ...)."""
+    data = bytearray(b"\xf7\x00")
+    data.extend(body)
+    data.extend(b"\x00\xee")
+    data[1] = len(data)
+    data[-2] = makesum(data)
+    return bytes(data)
+
+
+@dataclass
+class SimulatorConfig:
+    """Apartment and bus model of the simulator."""
+
+    rooms: int = 4
+    lights: int = 2
+    dimmers: int = 0
+    outlets: int = 2
+    thermostats: bool = True
+    gas: bool = True
+    fan: bool = True
+    baud_rate: int = 9600
+    response_delay: float = 0.02
+    jitter: float = 0.01
+    report_interval: float = 1.0
+    seed: int | None = None
+
+
+@dataclass
+class _State:
+    """States of the simulated devices, keyed by (room, sub)."""
+
+    lights: dict[tuple[int, int], int] = field(default_factory=dict)
+    dimmers: dict[tuple[int, int], int] = field(default_factory=dict)
+    outlets: dict[tuple[int, int], int] = field(default_factory=dict)
+    thermostats: dict[int, list[int]] = field(default_factory=dict)
+    gas: int = 0x04
+    fan: list[int] = field(default_factory=lambda: [0x02, 0x00])
+
+
+class WallPadSimulator:
+    """Answers Imazu packets like a wall pad behind an EW11."""
+
+    def __init__(self, config: SimulatorConfig | None = None) -> None:
+        """Initialize the simulator."""
+        self.config = config or SimulatorConfig()
+        self.frames_received = 0
+        self.frames_sent = 0
+        self._random = random.Random(self.config.seed)
+        self._state = _State()
+        for room in range(1, self.config.rooms + 1):
+            for sub in range(1, self.config.lights + 1):
+                self._state.lights[(room, sub)] = POWER_OFF
+            for sub in range(1, self.config.dimmers + 1):
+                self._state.dimmers[(room, sub)] = 0
+            for sub in range(1, self.config.outlets + 1):
+                self._state.outlets[(room, sub)] = POWER_ON
+            if self.config.thermostats:
+                self._state.thermostats[room] = [THERMOSTAT_HEAT, 22, 23]
+        self._server: asyncio.Server | None = None
+        self._writers: set[asyncio.StreamWriter] = set()
+        self._bus = asyncio.Lock()
+
+    @property
+    def port(self) -> int:
+        """Return the port the simulator listens on."""
+        assert self._server is not None
+        return self._server.sockets[0].getsockname()[1]
+
+    @property
+    def device_count(self) -> int:
+        """Return the number of simulated devices."""
+        state = self._state
+        return (
+            len(state.lights)
+            + len(state.dimmers)
+            + len(state.outlets)
+            + len(state.thermostats)
+            + int(self.config.gas)
+            + int(self.config.fan)
+        )
+
+    async def async_start(self, host: str = "127.0.0.1", port: int = 0) -> None:
+        """Start listening."""
+        self._server = await asyncio.start_server(self._async_handle, host, port)
+
+    async def async_stop(self) -> None:
+        """Stop listening and close the clients."""
+        if self._server is None:
+            return
+        self._server.close()
+        for writer in list(self._writers):
+            writer.close()
+        await self._server.wait_closed()
+        self._server = None
+
+    def _bus_time(self, size: int) -> float:
+        """Return the time a frame of this size takes on the serial bus."""
+        return size * 10 / self.config.baud_rate
+
+    async def _async_write(self, writer: asyncio.StreamWriter, frame: bytes) -> None:
+        """Write a frame once the half duplex bus is free."""
+        async with self._bus:
+            delay = self.config.response_delay + self._bus_time(len(frame))
+            if self.config.jitter:
+                delay += self._random.uniform(0, self.config.jitter)
+            await asyncio.sleep(delay)
+            writer.write(frame)
+            await writer.drain()
+            self.frames_sent += 1
+
+    async def _async_report(self, writer: asyncio.StreamWriter) -> None:
+        """Report the state of a random room now and then."""
+        while True:
+            await asyncio.sleep(self.config.report_interval)
+            room = self._random.randint(1, max(self.config.rooms, 1))
+            frames = self._status(LIGHT, BOOL, room << 4, 0) or self._status(
+                OUTLET, BOOL, room << 4, 0
+            )
+            for frame in frames:
+                await self._async_write(writer, frame)
+
+    async def _async_handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Serve one client."""
+        self._writers.add(writer)
+        report = None
+        if self.config.report_interval > 0:
+            report = asyncio.create_task(self._async_report(writer))
+        buffer = b""
+        try:
+            while data := await reader.read(512):
+                buffer += data
+                while (end := buffer.find(b"\xee")) != -1:
+                    start = buffer.rfind(b"\xf7", 0, end)
+                    frame, buffer = buffer[start : end + 1], buffer[end + 1 :]
+                    if start == -1 or not checksum(frame):
+                        continue
+                    self.frames_received += 1
+                    await asyncio.sleep(self._bus_time(len(frame)))
+                    for answer in self.answer(frame):
+                        await self._async_write(writer, answer)
+        except ConnectionError:
+            pass
+        finally:
+            if report is not None:
+                report.cancel()
+            self._writers.discard(writer)
+            writer.close()
+
+    def answer(self, frame: bytes) -> list[bytes]:
+        """Return the frames the wall pad answers a frame with."""
+        # f7, len, 01 or 1a, device, cmd, value_type, sub, change_value, ...
+        device, cmd, value_type, sub, value = frame[3:8]
+        if cmd == CHANGE and not self._change(device, value_type, sub, value):
+            return []
+        if cmd not in (SCAN, CHANGE):
+            return []
+        if device == FAN and cmd == CHANGE:
+            return self._fan_answer(value_type, sub, value)
+        return self._status(device, value_type, sub, value if cmd == CHANGE else 0)
+
+    def _change(self, device: int, value_type: int, sub: int, value: int) -> bool:
+        """Apply a change packet, return False for unknown devices."""
+        key = (sub >> 4, sub & 0x0F)
+        state = self._state
+        if device == LIGHT and key in state.lights:
+            state.lights[key] = value
+        elif device == OUTLET and key in state.outlets:
+            state.outlets[key] = value
+        elif device == DIMMING and key in state.dimmers:
+            if value_type == BOOL:
+                state.dimmers[key] = 0 if value == POWER_OFF else 1
+            else:
+                state.dimmers[key] = _DIM_CHANGE.get(value, 3)
+        elif device == THERMOSTAT and (sub & 0x0F) in state.thermostats:
+            index = 0 if value_type == MODE else 2
+            state.thermostats[sub & 0x0F][index] = value
+        elif device == GAS and self.config.gas:
+            state.gas = value
+        elif device == FAN and self.config.fan:
+            if value_type == BOOL and value == POWER_OFF:
+                state.fan = [value, 0x00]
+            elif value_type == BOOL:
+                state.fan = [value, state.fan[1] or 0x01]
+            else:
+                state.fan = [0x01, value]
+        else:
+            return False
+        return True
+
+    def _status(self, device: int, value_type: int, sub: int, value: int) -> list[bytes]:
+        """Return the status frames of a device or of a whole room."""
+        room, index = sub >> 4, sub & 0x0F
+        state = self._state
+        head = bytearray((0x01, device, STATUS, value_type, sub, value))
+
+        if device in (LIGHT, OUTLET, DIMMING):
+            if device == DIMMING:
+                table = state.dimmers
+            else:
+                table = state.lights if device == LIGHT else state.outlets
+            subs = sorted(s for r, s in table if r == room)
+            if not subs or (index and index not in subs):
+                return []
+            if device == DIMMING:
+                levels = _DIM_ROOM if index == 0 else _DIM_DEVICE
+                states = [levels[table[(room, s)]] for s in subs]
+            else:
+                states = [table[(room, s)] for s in subs]
+            if index:
+                states = [states[subs.index(index)]]
+            return [make_frame(head + bytes(states))]
+
+        if device == THERMOSTAT and state.thermostats:
+            if index == 0:
+                body = b"".join(
+                    bytes(state.thermostats.get(i, (0, 0, 0)))
+                    for i in range(1, max(state.thermostats) + 1)
+                )
+            elif index in state.thermostats:
+                body = bytes(state.thermostats[index])
+            else:
+                return []
+            return [make_frame(head + body)]
+
+        if device == GAS and self.config.gas and sub == 0x11:
+            return [make_frame(head + bytes((state.gas, 0, 0)))]
+
+        if device == FAN and self.config.fan and sub == 0x11:
+            return [make_frame(head + bytes(state.fan))]
+
+        return []
+
+    def _fan_answer(self, value_type: int, sub: int, value: int) -> list[bytes]:
+        """Return the frames a fan answers a change with.
+
+        Turning it off and changing the speed are answered with a multi status
+        packet: 2b 04 40 stands where the sub goes, the sub follows with a
+        change value of 00. Only the top speed is echoed as well.
+        """
+        if sub != 0x11:
+            return []
+        if value_type == BOOL and value != POWER_OFF:
+            return self._status(FAN, value_type, sub, value)
+        multi = bytes((0x01, FAN, STATUS, MULTI, FAN, STATUS, BOOL, sub, 0x00))
+        frames = [make_frame(multi + bytes(self._state.fan))]
+        if value_type == DIM and value == 0x07:
+            frames[:0] = self._status(FAN, value_type, sub, value)
+        return frames
+
+
+async def _async_main(args: argparse.Namespace) -> None:
+    """Run the simulator until interrupted."""
+    simulator = WallPadSimulator(
+        SimulatorConfig(
+            rooms=args.rooms,
+            lights=args.lights,
+            dimmers=args.dimmers,
+            outlets=args.outlets,
+            baud_rate=args.baud_rate,
+            response_delay=args.response_delay,
+            jitter=args.jitter,
+            report_interval=args.report_interval,
+        )
+    )
+    await simulator.async_start(args.host, args.port)
+    _LOGGER.info(
+        "Simulating %d devices on %s:%d",
+        simulator.device_count,
+        args.host,
+        simulator.port,
+    )
+    await asyncio.Event().wait()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8899)
+    parser.add_argument("--rooms", type=int, default=4)
+    parser.add_argument("--lights", type=int, default=2)
+    parser.add_argument("--dimmers", type=int, default=0)
+    parser.add_argument("--outlets", type=int, default=2)
+    parser.add_argument("--baud-rate", type=int, default=9600)
+    parser.add_argument("--response-delay", type=float, default=0.02)
+    parser.add_argument("--jitter", type=float, default=0.01)
+    parser.add_argument("--report-interval", type=float, default=1.0)
+    logging.basicConfig(level=logging.INFO)
+    try:
+        asyncio.run(_async_main(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
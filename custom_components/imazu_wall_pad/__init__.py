@@ -3,25 +3,49 @@
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import EVENT_HOMEASSISTANT_STOP
 from homeassistant.core import Event, HomeAssistant
-from .const import DOMAIN, PLATFORMS
-from .gateway import ImazuGateway
+from homeassistant.helpers import device_registry as dr
+import homeassistant.helpers.config_validation as cv
+from homeassistant.helpers.typing import ConfigType
+from .const import BRAND_NAME, DOMAIN, MANUFACTURER, MODEL, PLATFORMS, SW_VERSION
+from .gateway import ImazuGateway, snapshot_store
+from .services import async_setup_services
 
 type ImazuWallPadConfigEntry = ConfigEntry[ImazuGateway]  # noqa: F821
 
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the Imazu Wall Pad services."""
+    async_setup_services(hass)
+    return True
+
 
 async def async_setup_entry(
     hass: HomeAssistant, entry: ImazuWallPadConfigEntry
 ) -> bool:
     """Set up Imazu Wall Pad from a config entry."""
     imazu_gateway = ImazuGateway(hass, entry)
-    await imazu_gateway.async_load_entity_registry()
+    await imazu_gateway.async_load_packets()
 
-    if not await imazu_gateway.async_connect():
-        await imazu_gateway.async_close()
-        return False
+    device_registry = dr.async_get(hass)
+    device_registry.async_get_or_create(
+        config_entry_id=entry.entry_id,
+        identifiers={(DOMAIN, imazu_gateway.host)},
+        manufacturer=MANUFACTURER,
+        model=MODEL,
+        name=f"{BRAND_NAME} wall pad".title(),
+        sw_version=SW_VERSION,
+    )
 
     entry.runtime_data = imazu_gateway
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    entry.async_on_unload(imazu_gateway.async_start_polling())
+    entry.async_on_unload(imazu_gateway.async_start_metrics())
+    entry.async_on_unload(imazu_gateway.async_start_watchdog())
+    entry.async_create_background_task(
+        hass, imazu_gateway.async_start(), f"{DOMAIN}_{imazu_gateway.host}_start"
+    )
 
     async def _async_stop(event: Event) -> None:
         """Close the connection."""
@@ -30,9 +54,15 @@ async def async_setup_entry(
     entry.async_on_unload(
         hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, _async_stop)
     )
+    entry.async_on_unload(entry.add_update_listener(_async_update_listener))
     return True
 
 
+async def _async_update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Reload the config entry when the options change."""
+    await hass.config_entries.async_reload(entry.entry_id)
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
@@ -40,3 +70,8 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         await imazu_gateway.async_close()
 
     return unload_ok
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the device snapshot of a deleted config entry."""
+    await snapshot_store(hass, entry.entry_id).async_remove()
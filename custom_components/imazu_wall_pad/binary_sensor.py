@@ -26,22 +26,27 @@ async def async_setup_entry(
     gateway: ImazuGateway = entry.runtime_data
 
     @callback
-    def async_add_entity(entity_data: EntityData):
-        if isinstance(entity_data.packet, AwayPacket):
+    def async_add_entity(entities: list[EntityData]):
+        devices = []
+        for entity_data in entities:
+            if not isinstance(entity_data.packet, AwayPacket):
+                continue
             if "power" in entity_data.packet.state:
                 entity_data.device = WPAwayLight(
                     gateway, Platform.BINARY_SENSOR, entity_data.packet
                 )
-                async_add_entities([entity_data.device])
             elif "valve" in entity_data.packet.state:
                 entity_data.device = WPAwayGasValve(
                     gateway, Platform.BINARY_SENSOR, entity_data.packet
                 )
-                async_add_entities([entity_data.device])
+            else:
+                continue
+            devices.append(entity_data.device)
+        if devices:
+            async_add_entities(devices)
 
     entities = gateway.get_platform_entities(Platform.BINARY_SENSOR)
-    for data in entities:
-        async_add_entity(data)
+    async_add_entity(entities)
 
     entry.async_on_unload(
         async_dispatcher_connect(
@@ -61,8 +66,6 @@ class WPAwayLight(WallPadDevice[AwayPacket], BinarySensorEntity):
         """Set up binary_sensor."""
         super().__init__(gateway, platform, packet)
 
-        self._attr_should_poll = False
-
         self.entity_id = (
             f"{str(platform.value)}."
             f"{BRAND_NAME}_{host_to_last(self.gateway.host)}_"
@@ -95,8 +98,6 @@ class WPAwayGasValve(WallPadDevice[AwayPacket], BinarySensorEntity):
         """Set up binary_sensor."""
         super().__init__(gateway, platform, packet)
 
-        self._attr_should_poll = False
-
         self.entity_id = (
             f"{str(platform.value)}."
             f"{BRAND_NAME}_{host_to_last(self.gateway.host)}_"
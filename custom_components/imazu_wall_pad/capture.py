@@ -0,0 +1,140 @@
+"""Capture and replay of Wall Pad bus frames."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import mmap
+import struct
+import time
+from collections.abc import Awaitable, Callable, Iterator
+from datetime import datetime, timedelta
+from itertools import islice
+from pathlib import Path
+
+from wp_imazu.packet import ImazuPacket
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
+from .frame import decode_frame, valid_frame
+
+_LOGGER = logging.getLogger(__name__)
+
+CAPTURE_MAGIC = b"IMZC\x01"
+CAPTURE_SUFFIX = ".cap"
+CAPTURE_FLUSH_INTERVAL = timedelta(seconds=5)
+REPLAY_BATCH_SIZE = 1000
+
+# Monotonic time in nanoseconds and frame length, followed by the frame
+_RECORD = struct.Struct("<QH")
+
+
+def _create_capture(path: Path) -> None:
+    """Create an empty capture file."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("xb") as file:
+        file.write(CAPTURE_MAGIC)
+
+
+def _append_capture(path: Path, data: bytes) -> None:
+    """Append records to a capture file."""
+    with path.open("ab") as file:
+        file.write(data)
+
+
+def iter_capture(path: Path) -> Iterator[tuple[int, bytes]]:
+    """Yield the timestamp and frame of every record, mapping the file."""
+    with path.open("rb") as file, mmap.mmap(
+        file.fileno(), 0, access=mmap.ACCESS_READ
+    ) as data:
+        if data[: len(CAPTURE_MAGIC)] != CAPTURE_MAGIC:
+            raise ValueError(f"Not a capture file: {path}")
+        offset, end = len(CAPTURE_MAGIC), len(data)
+        while offset + _RECORD.size <= end:
+            timestamp, size = _RECORD.unpack_from(data, offset)
+            offset += _RECORD.size
+            if offset + size > end:
+                _LOGGER.debug("Capture ends with a partial record, %s", path)
+                break
+            yield timestamp, data[offset : offset + size]
+            offset += size
+
+
+class FrameCapture:
+    """Appends the received frames to a capture file."""
+
+    def __init__(self, hass: HomeAssistant, path: Path) -> None:
+        """Initialize the frame capture."""
+        self._hass = hass
+        self.path = path
+        self._buffer = bytearray()
+        self._lock = asyncio.Lock()
+        self._unsub: CALLBACK_TYPE | None = None
+
+    async def async_start(self) -> None:
+        """Create the capture file and flush it on an interval."""
+        await self._hass.async_add_executor_job(_create_capture, self.path)
+        self._unsub = async_track_time_interval(
+            self._hass, self.async_flush, CAPTURE_FLUSH_INTERVAL
+        )
+
+    @callback
+    def append(self, frame: bytes) -> None:
+        """Buffer a frame until the next flush."""
+        self._buffer += _RECORD.pack(time.monotonic_ns(), len(frame))
+        self._buffer += frame
+
+    async def async_flush(self, now: datetime | None = None) -> None:
+        """Write the buffered frames to the capture file."""
+        if not self._buffer:
+            return
+        data, self._buffer = bytes(self._buffer), bytearray()
+        async with self._lock:
+            await self._hass.async_add_executor_job(_append_capture, self.path, data)
+
+    async def async_stop(self) -> None:
+        """Stop flushing and write what is left."""
+        if self._unsub is not None:
+            self._unsub()
+            self._unsub = None
+        await self.async_flush()
+
+
+async def async_replay_capture(
+    hass: HomeAssistant,
+    path: Path,
+    packet_handler: Callable[[ImazuPacket], Awaitable[None]],
+    realtime: bool = False,
+) -> int:
+    """Feed the frames of a capture to a packet handler, return the frame count.
+
+    In realtime the frames keep the time between them, otherwise they are fed
+    as fast as the handler takes them. The file is read in batches off the loop.
+    """
+    records = iter_capture(path)
+    start: tuple[int, int] | None = None
+    count = 0
+    try:
+        while batch := await hass.async_add_executor_job(
+            list, islice(records, REPLAY_BATCH_SIZE)
+        ):
+            for timestamp, frame in batch:
+                if realtime:
+                    if start is None:
+                        start = (time.monotonic_ns(), timestamp)
+                    delay = (timestamp - start[1]) - (time.monotonic_ns() - start[0])
+                    if delay > 0:
+                        await asyncio.sleep(delay / 1e9)
+                count += 1
+                if not valid_frame(frame):
+                    continue
+                try:
+                    packets = decode_frame(frame)
+                except Exception as ex:  # pylint: disable=broad-except
+                    _LOGGER.debug("Replay parse error, %s, %s", ex, frame.hex())
+                    continue
+                for packet in packets:
+                    await packet_handler(packet)
+    finally:
+        await hass.async_add_executor_job(records.close)
+    return count
@@ -0,0 +1,105 @@
+"""Socket client of Wall Pad."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections.abc import Callable
+
+from wp_imazu.client import ImazuClient
+from wp_socket.client import _WpSendData
+
+_LOGGER = logging.getLogger(__name__)
+
+# Seconds without a single byte before a read fails, the gateway watchdog
+# usually notices the silence first.
+READ_TIMEOUT = 60
+
+
+class ImazuWallPadClient(ImazuClient):
+    """Imazu client leaving reconnects to the gateway."""
+
+    def __init__(
+        self, host: str, port: int, on_link_lost: Callable[[str], None], **kwds
+    ) -> None:
+        """Initialize the client."""
+        kwds.setdefault("read_timeout", READ_TIMEOUT)
+        super().__init__(host, port, **kwds)
+        self.on_link_lost = on_link_lost
+        self._pending: set[_WpSendData] = set()
+
+    @property
+    def send_interval(self) -> float:
+        """Return the seconds kept between two sent frames."""
+        return self._config.send_packet_interval
+
+    def set_intervals(self, send_interval: float, receive_interval: float) -> None:
+        """Set the seconds kept after a sent and after a received frame."""
+        self._config.send_packet_interval = send_interval
+        self._config.receive_packet_interval = receive_interval
+
+    @staticmethod
+    def make_frame(packet: bytes) -> bytes | None:
+        """Return the frame written for an imazu packet, None if invalid."""
+        if (data := ImazuClient._make_packet(packet)) is None:
+            return None
+        return bytes(data)
+
+    async def async_send(self, packet: bytes) -> bool:
+        """Send an imazu packet, return False if it was not written."""
+        if (frame := self.make_frame(packet)) is None:
+            return False
+        return await self.async_send_frame(frame)
+
+    async def async_send_frame(self, frame: bytes) -> bool:
+        """Send a whole frame, return False if it was not written."""
+        if not self.connected:
+            return False
+        send_data = _WpSendData(frame)
+        self._pending.add(send_data)
+        try:
+            await self._send_packet_queue.put(send_data)
+            return await send_data.wait()
+        finally:
+            self._pending.discard(send_data)
+
+    def disconnect(self) -> None:
+        """Disconnect, failing the packets not written yet.
+
+        The packets are failed even once disconnected, as the writer of the
+        lost link may still take one off the queue and die before writing it.
+        """
+        super().disconnect()
+        # A new link starts with an empty queue.
+        while not self._send_packet_queue.empty():
+            self._send_packet_queue.get_nowait()
+            self._send_packet_queue.task_done()
+        for send_data in self._pending:
+            send_data.set(False)
+
+    async def _async_reconnect(self) -> None:
+        """Report a failed read or write instead of reconnecting in place."""
+        self.on_link_lost("read or write failed")
+
+    async def _async_reader(self) -> None:
+        """Read the socket, reporting the peer closing it."""
+        _LOGGER.debug("reader start")
+        while self.connected:
+            try:
+                data = await asyncio.wait_for(
+                    self._reader.read(self._config.read_buffer_size),
+                    timeout=self._config.read_timeout,
+                )
+            except Exception as ex:  # pylint: disable=broad-except
+                _LOGGER.error("reader error, %s", ex)
+                self.on_link_lost("read failed")
+                break
+            if not data:
+                # The stream returns nothing, without waiting, once at EOF.
+                self.on_link_lost("closed by the peer")
+                break
+            self._last_receive_time = time.time()
+            _LOGGER.debug("Received [%d]: %s", len(data), data.hex())
+            await self._receive_packet_queue.put(data)
+        _LOGGER.debug("reader end")
@@ -15,15 +15,10 @@ from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from . import ImazuGateway, ImazuWallPadConfigEntry
+from .const import MODE_AWAY, MODE_HEAT, MODE_OFF, SCAN_THERMOSTAT_PACKETS
 from .gateway import EntityData
 from .wall_pad import WallPadDevice
 
-SCAN_THERMOSTAT_PACKETS = ["01180146100000"]
-
-MODE_OFF = "Off"
-MODE_HEAT = "Heat"
-MODE_AWAY = "Away"
-
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -34,26 +29,26 @@ async def async_setup_entry(
     gateway: ImazuGateway = entry.runtime_data
 
     @callback
-    def async_add_entity(entity_data: EntityData):
-        if isinstance(entity_data.packet, ThermostatPacket):
-            entity_data.device = WPClimate(
-                gateway, Platform.CLIMATE, entity_data.packet
-            )
-            async_add_entities([entity_data.device])
+    def async_add_entity(entities: list[EntityData]):
+        devices = []
+        for entity_data in entities:
+            if isinstance(entity_data.packet, ThermostatPacket):
+                entity_data.device = WPClimate(
+                    gateway, Platform.CLIMATE, entity_data.packet
+                )
+                devices.append(entity_data.device)
+        if devices:
+            async_add_entities(devices)
 
     entities = gateway.get_platform_entities(Platform.CLIMATE)
-    for data in entities:
-        async_add_entity(data)
+    async_add_entity(entities)
 
     entry.async_on_unload(
         async_dispatcher_connect(
             hass, gateway.entity_add_signal(Platform.CLIMATE), async_add_entity
         )
     )
-
-    if len(entities) == 0:
-        for packet in SCAN_THERMOSTAT_PACKETS:
-            await gateway.async_send(bytes.fromhex(packet))
+    gateway.async_add_scan_packets(SCAN_THERMOSTAT_PACKETS)
 
 
 class WPClimate(WallPadDevice[ThermostatPacket], ClimateEntity):
@@ -73,16 +68,19 @@ class WPClimate(WallPadDevice[ThermostatPacket], ClimateEntity):
     _attr_supported_features = (
         ClimateEntityFeature.TARGET_TEMPERATURE | ClimateEntityFeature.PRESET_MODE
     )
+    # Room temperatures flicker by a degree between readings, a degree is shown
+    # once it lasts.
+    _state_deadbands = {"temp": 1}
 
     @property
     def current_temperature(self) -> float:
         """Return the current temperature."""
-        return self.packet.state["temp"]
+        return self.packet_state["temp"]
 
     @property
     def target_temperature(self) -> float:
         """Return the temperature we try to reach."""
-        return self.packet.state["target"]
+        return self.packet_state["target"]
 
     @property
     def hvac_action(self) -> HVACAction:
@@ -97,7 +95,7 @@ class WPClimate(WallPadDevice[ThermostatPacket], ClimateEntity):
         if not self.available:
             return HVACMode.OFF
 
-        if self.packet.state["mode"] == ThermostatPacket.Mode.OFF:
+        if self.packet_state["mode"] == ThermostatPacket.Mode.OFF:
             return HVACMode.OFF
         return HVACMode.HEAT
 
@@ -107,7 +105,7 @@ class WPClimate(WallPadDevice[ThermostatPacket], ClimateEntity):
         if not self.available:
             return MODE_OFF
 
-        mode: ThermostatPacket.Mode = self.packet.state["mode"]
+        mode: ThermostatPacket.Mode = self.packet_state["mode"]
         if mode == ThermostatPacket.Mode.HEAT:
             return MODE_HEAT
         if mode == ThermostatPacket.Mode.AWAY:
@@ -126,14 +124,15 @@ class WPClimate(WallPadDevice[ThermostatPacket], ClimateEntity):
         if (target := int(kwargs[ATTR_TEMPERATURE])) is None:
             return
         make_packet = self.packet.make_change_target_temp(target)
-        await super().async_send_packet(make_packet)
+        await super().async_send_packet(make_packet, expected_state={"target": target})
 
     async def async_set_preset_mode(self, preset_mode: str) -> None:
         """Set the preset mode of the climate."""
         if preset_mode == MODE_HEAT:
-            make_packet = self.packet.make_change_mode(ThermostatPacket.Mode.HEAT)
+            mode = ThermostatPacket.Mode.HEAT
         elif preset_mode == MODE_AWAY:
-            make_packet = self.packet.make_change_mode(ThermostatPacket.Mode.AWAY)
+            mode = ThermostatPacket.Mode.AWAY
         else:
-            make_packet = self.packet.make_change_mode(ThermostatPacket.Mode.OFF)
-        await super().async_send_packet(make_packet)
+            mode = ThermostatPacket.Mode.OFF
+        make_packet = self.packet.make_change_mode(mode)
+        await super().async_send_packet(make_packet, expected_state={"mode": mode})
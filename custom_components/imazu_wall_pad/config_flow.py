@@ -5,14 +5,27 @@ import logging
 from typing import Any
 
 import voluptuous as vol
-from wp_imazu.client import ImazuClient
 
-from homeassistant.config_entries import ConfigFlow
+from homeassistant.config_entries import ConfigEntry, ConfigFlow, OptionsFlow
 from homeassistant.const import CONF_HOST, CONF_PORT
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.data_entry_flow import FlowResult
 import homeassistant.helpers.config_validation as cv
 
-from .const import DEFAULT_PORT, DOMAIN
+from .const import (
+    CONF_IDLE_GAP,
+    CONF_OPTIMISTIC,
+    CONF_SEND_INTERVAL,
+    CONF_WRITE_INTERVAL,
+    DEFAULT_IDLE_GAP,
+    DEFAULT_OPTIMISTIC,
+    DEFAULT_PORT,
+    DEFAULT_SEND_INTERVAL,
+    DEFAULT_WRITE_INTERVAL,
+    DOMAIN,
+    SCAN_PACKETS,
+)
+from .handoff import ValidatedConnection
 from .helper import format_host
 
 _LOGGER = logging.getLogger(__name__)
@@ -24,15 +37,38 @@ CONFIG_SCHEMA = vol.Schema(
     }
 )
 
+OPTIONS_SCHEMA = vol.Schema(
+    {
+        vol.Optional(CONF_SEND_INTERVAL, default=DEFAULT_SEND_INTERVAL): vol.All(
+            vol.Coerce(int), vol.Range(min=50, max=2000)
+        ),
+        vol.Optional(CONF_IDLE_GAP, default=DEFAULT_IDLE_GAP): vol.All(
+            vol.Coerce(int), vol.Range(min=0, max=1000)
+        ),
+        vol.Optional(CONF_OPTIMISTIC, default=DEFAULT_OPTIMISTIC): bool,
+        vol.Optional(CONF_WRITE_INTERVAL, default=DEFAULT_WRITE_INTERVAL): vol.All(
+            vol.Coerce(int), vol.Range(min=0, max=300)
+        ),
+    }
+)
 
-async def async_validate_connection(host: str, port: int) -> dict[str, str]:
-    """Validate if a connection to Wall Pad can be established."""
+
+async def async_validate_connection(
+    hass: HomeAssistant, host: str, port: int
+) -> dict[str, str]:
+    """Validate if a connection to Wall Pad can be established.
+
+    The connection and the answers to one round of scans are kept for the
+    setup of the entry, which then starts without connecting again.
+    """
     errors = {}
 
-    client = ImazuClient(host, port)
-    if not await client.async_connect():
+    connection = ValidatedConnection(hass, host, port)
+    if not await connection.async_connect():
         errors["base"] = "cannot_connect"
-    client.disconnect()
+        return errors
+    await connection.async_scan(SCAN_PACKETS)
+    connection.async_hand_off()
 
     return errors
 
@@ -42,6 +78,12 @@ class WallPadConfigFlow(ConfigFlow, domain=DOMAIN):
 
     VERSION = 1
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry: ConfigEntry) -> OptionsFlow:
+        """Get the options flow for this handler."""
+        return WallPadOptionsFlow()
+
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
@@ -52,12 +94,31 @@ class WallPadConfigFlow(ConfigFlow, domain=DOMAIN):
         host = user_input[CONF_HOST]
         port = user_input[CONF_PORT]
 
-        if errors := await async_validate_connection(host, port):
+        await self.async_set_unique_id(format_host(host))
+        self._abort_if_unique_id_configured()
+
+        if errors := await async_validate_connection(self.hass, host, port):
             return self.async_show_form(
                 step_id="user",
                 data_schema=CONFIG_SCHEMA,
                 errors=errors,
             )
-        host_formatted = format_host(host)
-        await self.async_set_unique_id(host_formatted)
         return self.async_create_entry(title=host, data=user_input)
+
+
+class WallPadOptionsFlow(OptionsFlow):
+    """Handle an options flow for Imazu Wall Pad."""
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Manage the options."""
+        if user_input is not None:
+            return self.async_create_entry(data=user_input)
+
+        return self.async_show_form(
+            step_id="init",
+            data_schema=self.add_suggested_values_to_schema(
+                OPTIONS_SCHEMA, self.config_entry.options
+            ),
+        )
@@ -10,15 +10,63 @@ SW_VERSION = "1.0"
 
 DEFAULT_PORT = 8899
 
+CONF_SEND_INTERVAL = "send_interval"
+DEFAULT_SEND_INTERVAL = 400  # ms
+CONF_OPTIMISTIC = "optimistic"
+DEFAULT_OPTIMISTIC = True
+CONF_IDLE_GAP = "idle_gap"
+DEFAULT_IDLE_GAP = 50  # ms
+CONF_WRITE_INTERVAL = "write_interval"
+DEFAULT_WRITE_INTERVAL = 10  # s
+
 PLATFORMS = [
     Platform.BINARY_SENSOR,
     Platform.LIGHT,
     Platform.SWITCH,
     Platform.FAN,
     Platform.CLIMATE,
+    Platform.SENSOR,
 ]
 PACKET = "packet"
 
+SCAN_LIGHT_PACKETS = [
+    # Light
+    "01190140100000",
+    "01190140200000",
+    "01190140300000",
+    "01190140400000",
+    "01190140500000",
+    "01190140600000",
+    # Dimmer
+    "011a0142100000",
+    "011a0142200000",
+    "011a0142300000",
+    "011a0142400000",
+    "011a0142500000",
+    "011a0142600000",
+]
+SCAN_SWITCH_PACKETS = [
+    "011f0140100000",
+    "011f0140200000",
+    "011f0140300000",
+    "011f0140400000",
+    "011f0140500000",
+    "011f0140600000",
+    "011b0143110000",
+]
+SCAN_FAN_PACKET = ["012b0140110000"]
+SCAN_THERMOSTAT_PACKETS = ["01180146100000"]
+SCAN_PACKETS = [
+    *SCAN_LIGHT_PACKETS,
+    *SCAN_SWITCH_PACKETS,
+    *SCAN_FAN_PACKET,
+    *SCAN_THERMOSTAT_PACKETS,
+]
+
+MODE_OFF = "Off"
+MODE_HEAT = "Heat"
+MODE_AWAY = "Away"
+
 ATTR_DEVICE = "device"
 ATTR_ROOM_ID = "room_id"
 ATTR_SUB_ID = "sub_id"
@@ -0,0 +1,51 @@
+"""Diagnostics support for Imazu Wall Pad."""
+
+from __future__ import annotations
+
+from enum import Enum
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.const import CONF_HOST
+from homeassistant.core import HomeAssistant
+from . import ImazuWallPadConfigEntry
+from .gateway import PACKET_PLATFORMS
+
+TO_REDACT = {CONF_HOST}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ImazuWallPadConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    gateway = entry.runtime_data
+
+    platforms = {
+        str(platform.value): {
+            entity_data.packet.device_id: {
+                "entity_id": entity_data.device.entity_id
+                if entity_data.device
+                else None,
+                "packet": entity_data.packet.hex(),
+                "state": {
+                    key: value.name if isinstance(value, Enum) else value
+                    for key, value in entity_data.packet.state.items()
+                },
+            }
+            for entity_data in gateway.get_platform_entities(platform)
+        }
+        for platform in dict.fromkeys(PACKET_PLATFORMS.values())
+    }
+
+    return {
+        "entry": {
+            "data": async_redact_data(entry.data, TO_REDACT),
+            "options": dict(entry.options),
+        },
+        "connected": gateway.connected,
+        "send_queue": gateway.send_queue_size,
+        "metrics": gateway.metrics.as_dict(),
+        "polling": gateway.polling.as_dict(),
+        "platforms": platforms,
+        "frames": gateway.frame_history.as_list(),
+    }
@@ -0,0 +1,118 @@
+"""Discovery of Wall Pad devices."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+
+from wp_imazu.packet import ImazuPacket
+
+from homeassistant.core import callback
+from .transmit import Priority
+
+_LOGGER = logging.getLogger(__name__)
+
+DISCOVERY_RESPONSE_TIMEOUT = 2.0
+DISCOVERY_RETRY_COUNT = 2
+
+
+def _scan_key(packet: bytes) -> tuple[int, int]:
+    """Return the device and room a scan packet asks for."""
+    # 01 or 1a, device, cmd, value_type, sub, change_value, state_value
+    return packet[1], packet[4] >> 4
+
+
+class ImazuDiscovery:
+    """Sends scan packets and tracks which of them were answered."""
+
+    def __init__(
+        self,
+        async_send: Callable[[bytes, Priority], Awaitable[None]],
+        on_finished: Callable[[], None],
+    ) -> None:
+        """Initialize Imazu discovery."""
+        self._async_send = async_send
+        self._on_finished = on_finished
+        self._scans: dict[tuple[int, int], bytes] = {}
+        self._answered: set[tuple[int, int]] = set()
+        self._devices: set[int] = set()
+        self._pending: set[tuple[int, int]] = set()
+        self._answered_event = asyncio.Event()
+        self._lock = asyncio.Lock()
+
+    @property
+    def discovering(self) -> bool:
+        """Return True while a discovery is running."""
+        return self._lock.locked()
+
+    @property
+    def unanswered(self) -> list[str]:
+        """Return the scan packets that were never answered."""
+        return [
+            packet.hex()
+            for key, packet in self._scans.items()
+            if key not in self._answered
+        ]
+
+    @callback
+    def async_add_scan_packets(self, packets: list[str]) -> None:
+        """Add the scan packets of a platform."""
+        for packet in packets:
+            scan = bytes.fromhex(packet)
+            self._scans[_scan_key(scan)] = scan
+
+    @callback
+    def async_packet_received(self, packet: ImazuPacket) -> None:
+        """Mark the scan asking for this device as answered."""
+        device = int(str(packet.device.value), 16)
+        key = (device, packet.room_id)
+        self._devices.add(device)
+        self._answered.add(key)
+        if key in self._pending:
+            self._pending.discard(key)
+            if not self._pending:
+                self._answered_event.set()
+
+    async def async_discover(self, rescan: bool = False) -> None:
+        """Scan for devices, retrying only the scans that got no answer.
+
+        On a normal start, device types that are already known are skipped and
+        left to polling. A rescan asks again for every room that never answered.
+        """
+        async with self._lock:
+            pending = {
+                key
+                for key in self._scans
+                if key not in self._answered
+                and (rescan or key[0] not in self._devices)
+            }
+            total = len(pending)
+
+            for _ in range(DISCOVERY_RETRY_COUNT + 1):
+                if not pending:
+                    break
+                self._pending = set(pending)
+                self._answered_event.clear()
+                for key in pending:
+                    try:
+                        await self._async_send(self._scans[key], Priority.DISCOVERY)
+                    except ConnectionError as ex:
+                        # Left pending, the next round asks again.
+                        _LOGGER.debug("Scan not sent, %s", ex)
+                if self._pending:
+                    try:
+                        await asyncio.wait_for(
+                            self._answered_event.wait(), DISCOVERY_RESPONSE_TIMEOUT
+                        )
+                    except asyncio.TimeoutError:
+                        pass
+                pending = set(self._pending)
+
+            self._pending.clear()
+            _LOGGER.debug(
+                "Discovery finished, %d of %d scans answered",
+                total - len(pending),
+                total,
+            )
+            self._on_finished()
@@ -14,11 +14,10 @@ from homeassistant.util.percentage import (
     percentage_to_ordered_list_item,
 )
 from . import ImazuGateway, ImazuWallPadConfigEntry
+from .const import SCAN_FAN_PACKET
 from .gateway import EntityData
 from .wall_pad import WallPadDevice
 
-SCAN_FAN_PACKET = ["012b0140110000"]
-
 MODE_OFF = "Off"
 MODE_AUTO = "Auto"
 MODE_MANUAL = "Manual"
@@ -38,24 +37,24 @@ async def async_setup_entry(
     gateway: ImazuGateway = entry.runtime_data
 
     @callback
-    def async_add_entity(entity_data: EntityData):
-        if isinstance(entity_data.packet, FanPacket):
-            entity_data.device = WPFan(gateway, Platform.FAN, entity_data.packet)
-            async_add_entities([entity_data.device])
+    def async_add_entity(entities: list[EntityData]):
+        devices = []
+        for entity_data in entities:
+            if isinstance(entity_data.packet, FanPacket):
+                entity_data.device = WPFan(gateway, Platform.FAN, entity_data.packet)
+                devices.append(entity_data.device)
+        if devices:
+            async_add_entities(devices)
 
     entities = gateway.get_platform_entities(Platform.FAN)
-    for data in entities:
-        async_add_entity(data)
+    async_add_entity(entities)
 
     entry.async_on_unload(
         async_dispatcher_connect(
             hass, gateway.entity_add_signal(Platform.FAN), async_add_entity
         )
     )
-
-    if len(entities) == 0:
-        for packet in SCAN_FAN_PACKET:
-            await gateway.async_send(bytes.fromhex(packet))
+    gateway.async_add_scan_packets(SCAN_FAN_PACKET)
 
 
 class WPFan(WallPadDevice[FanPacket], FanEntity):
@@ -69,7 +68,7 @@ class WPFan(WallPadDevice[FanPacket], FanEntity):
         """Return true if fan is on."""
         if not self.available:
             return False
-        mode: FanPacket.Mode = self.packet.state["mode"]
+        mode: FanPacket.Mode = self.packet_state["mode"]
         return mode != FanPacket.Mode.OFF
 
     @property
@@ -78,11 +77,11 @@ class WPFan(WallPadDevice[FanPacket], FanEntity):
         if not self.available:
             return 0
 
-        mode: FanPacket.Mode = self.packet.state["mode"]
+        mode: FanPacket.Mode = self.packet_state["mode"]
         if mode != FanPacket.Mode.MANUAL:
             return 0
 
-        speed: FanPacket.Speed = self.packet.state["speed"]
+        speed: FanPacket.Speed = self.packet_state["speed"]
         if speed == FanPacket.Speed.OFF:
             return 0
 
@@ -94,7 +93,7 @@ class WPFan(WallPadDevice[FanPacket], FanEntity):
         if not self.available:
             return MODE_OFF
 
-        mode: FanPacket.Mode = self.packet.state["mode"]
+        mode: FanPacket.Mode = self.packet_state["mode"]
         if mode == FanPacket.Mode.AUTO:
             return MODE_AUTO
         if mode == FanPacket.Mode.MANUAL:
@@ -121,17 +120,21 @@ class WPFan(WallPadDevice[FanPacket], FanEntity):
             else FanPacket.Speed.OFF
         )
         make_packet = self.packet.make_change_speed(speed)
-        await super().async_send_packet(make_packet)
+        expected_state = {"speed": speed}
+        if speed != FanPacket.Speed.OFF:
+            expected_state["mode"] = FanPacket.Mode.MANUAL
+        await super().async_send_packet(make_packet, expected_state=expected_state)
 
     async def async_set_preset_mode(self, preset_mode: str) -> None:
         """Set the preset mode of the fan."""
         if preset_mode == MODE_AUTO:
-            make_packet = self.packet.make_change_mode(FanPacket.Mode.AUTO)
+            mode = FanPacket.Mode.AUTO
         elif preset_mode == MODE_MANUAL:
-            make_packet = self.packet.make_change_mode(FanPacket.Mode.MANUAL)
+            mode = FanPacket.Mode.MANUAL
         else:
-            make_packet = self.packet.make_change_mode(FanPacket.Mode.OFF)
-        await super().async_send_packet(make_packet)
+            mode = FanPacket.Mode.OFF
+        make_packet = self.packet.make_change_mode(mode)
+        await super().async_send_packet(make_packet, expected_state={"mode": mode})
 
     async def async_turn_on(
         self,
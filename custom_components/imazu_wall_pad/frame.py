@@ -0,0 +1,144 @@
+"""Frames of the Wall Pad bus."""
+
+from __future__ import annotations
+
+import logging
+import time
+from array import array
+from datetime import UTC, datetime
+from functools import reduce
+from operator import xor
+
+from wp_imazu.packet import Cmd, Device, ImazuPacket, ValueType
+
+_LOGGER = logging.getLogger(__name__)
+
+PACKET_HEADER = b"\xf7"
+PACKET_TAIL = b"\xee"
+# f7, len, 01 or 1a, device, cmd, value_type, sub, change_value, checksum, ee
+MIN_FRAME_SIZE = 10
+
+# The packets of the library keep every byte as two hex digits
+_HEX = tuple(f"{value:02x}" for value in range(256))
+# Filled by the gateway as packet classes are routed to platforms
+_PACKET_CLASSES: dict[int, type[ImazuPacket]] = {}
+_STATUS = int(Cmd.STATUS.value, 16)
+_MULTI = int(ValueType.MULTI.value, 16)
+_FAN = int(Device.FAN.value, 16)
+
+
+def valid_frame(frame: bytes) -> bool:
+    """Return True if a frame has its own length and a matching checksum."""
+    if len(frame) < MIN_FRAME_SIZE or frame[1] != len(frame):
+        return False
+    with memoryview(frame) as view:
+        return reduce(xor, view[:-2], 0) == frame[-2]
+
+
+def frame_sub(frame: bytes) -> int:
+    """Return the sub byte of a frame, the room and the device in it."""
+    # A multi status packet of a fan repeats the device, cmd and value_type
+    # of the command before its sub: f7, len, 01, 2b, 04, 41, 2b, 04, 40, sub
+    if frame[3] == frame[6] == _FAN and frame[5] == _MULTI and len(frame) > 9:
+        return frame[9]
+    return frame[6]
+
+
+def status_frame(frame: bytes) -> bool:
+    """Return True if a frame reports a state, not a scan or a command."""
+    # f7, len, 01 or 1a, device, cmd, ...
+    return frame[4] == _STATUS
+
+
+def register_packet_class(device: Device, packet_type: type[ImazuPacket]) -> None:
+    """Decode the frames of a device to a packet class."""
+    _PACKET_CLASSES[int(str(device.value), 16)] = packet_type
+
+
+def known_device(device: int) -> bool:
+    """Return True if frames of a device byte decode to packets."""
+    return device in _PACKET_CLASSES
+
+
+def decode_frame(frame: bytes) -> list[ImazuPacket]:
+    """Return the status packets of a valid frame.
+
+    Scans, commands and frames of unknown devices are skipped before anything
+    is built. The bytes go to the packet class of their device as hex digits
+    from a table, as the library does with a hex string of the whole frame.
+    """
+    if not status_frame(frame):
+        return []
+    if (packet_class := _PACKET_CLASSES.get(frame[3])) is None:
+        return []
+    return packet_class([_HEX[value] for value in frame]).parse_state_packets()
+
+
+class FrameBuffer:
+    """Splits received bytes into frames, keeping a partial frame for later.
+
+    The bytes are collected in one reusable buffer and every frame is copied
+    out of it once, the rest is dropped in a single step after the split.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the frame buffer."""
+        self._buffer = bytearray()
+
+    @property
+    def partial(self) -> bool:
+        """Return True if the last bytes are an unfinished frame."""
+        return bool(self._buffer)
+
+    def feed(self, data: bytes) -> list[bytes]:
+        """Return the complete frames found in the buffered and received bytes."""
+        frames: list[bytes] = []
+        buffer = self._buffer
+        buffer += data
+        start = 0
+        with memoryview(buffer) as view:
+            while (end_idx := buffer.find(PACKET_TAIL, start)) != -1:
+                if (start_idx := buffer.rfind(PACKET_HEADER, start, end_idx)) == -1:
+                    _LOGGER.debug(
+                        "Frame without start, %s", view[start : end_idx + 1].hex()
+                    )
+                else:
+                    frames.append(bytes(view[start_idx : end_idx + 1]))
+                start = end_idx + 1
+        del buffer[:start]
+        return frames
+
+
+class FrameRing:
+    """Keeps the last frames seen on the bus in preallocated slots."""
+
+    def __init__(self, size: int) -> None:
+        """Initialize the frame ring."""
+        self._size = size
+        self._frames: list[bytes] = [b""] * size
+        self._times = array("d", [0.0]) * size
+        self._sent = bytearray(size)
+        self._index = 0
+        self._count = 0
+
+    def append(self, frame: bytes, sent: bool) -> None:
+        """Keep a frame, overwriting the oldest one when full."""
+        index = self._index
+        self._frames[index] = frame
+        self._times[index] = time.time()
+        self._sent[index] = sent
+        self._index = index + 1 if index + 1 < self._size else 0
+        if self._count < self._size:
+            self._count += 1
+
+    def as_list(self) -> list[dict[str, str]]:
+        """Return the kept frames, oldest first."""
+        start = (self._index - self._count) % self._size
+        return [
+            {
+                "time": datetime.fromtimestamp(self._times[index], UTC).isoformat(),
+                "direction": "tx" if self._sent[index] else "rx",
+                "frame": bytes(self._frames[index]).hex(),
+            }
+            for index in ((start + i) % self._size for i in range(self._count))
+        ]
@@ -2,13 +2,20 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
+import random
+import time
 from collections import defaultdict
+from collections.abc import Callable
 from dataclasses import dataclass
+from datetime import datetime, timedelta
+from functools import partial
+from pathlib import Path
 
-from wp_imazu.client import ImazuClient
 from wp_imazu.packet import (
     AwayPacket,
+    Device,
     GasPacket,
     ImazuPacket,
     LightPacket,
@@ -16,19 +23,79 @@ from wp_imazu.packet import (
     OutletPacket,
     FanPacket,
     ThermostatPacket,
-    parse_packet,
 )
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_HOST, CONF_PORT, Platform
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
 from homeassistant.helpers import entity_registry as er, restore_state
 from homeassistant.helpers.dispatcher import async_dispatcher_send
 from homeassistant.helpers.entity import Entity
-from .const import DOMAIN, PACKET
+from homeassistant.helpers.event import async_call_later, async_track_time_interval
+from homeassistant.helpers.storage import Store
+from .capture import FrameCapture, async_replay_capture
+from .client import ImazuWallPadClient
+from .const import (
+    CONF_IDLE_GAP,
+    CONF_OPTIMISTIC,
+    CONF_SEND_INTERVAL,
+    CONF_WRITE_INTERVAL,
+    DEFAULT_IDLE_GAP,
+    DEFAULT_OPTIMISTIC,
+    DEFAULT_SEND_INTERVAL,
+    DEFAULT_WRITE_INTERVAL,
+    DOMAIN,
+    PACKET,
+)
+from .discovery import ImazuDiscovery
+from .handoff import ValidatedConnection, async_take_connection
+from .frame import (
+    FrameBuffer,
+    FrameRing,
+    decode_frame,
+    frame_sub,
+    known_device,
+    register_packet_class,
+    status_frame,
+    valid_frame,
+)
+from .metrics import BusMetrics
+from .polling import PollScheduler
+from .transmit import Priority, TransmitScheduler
 
 _LOGGER = logging.getLogger(__name__)
 
+STORAGE_VERSION = 1
+SNAPSHOT_SAVE_DELAY = 30
+
+# Device groups are checked this often and polled once due
+POLL_CHECK_INTERVAL = timedelta(seconds=10)
+METRICS_INTERVAL = timedelta(seconds=30)
+UNSUPPORTED_LOG_INTERVAL = 3600
+FRAME_HISTORY_SIZE = 500
+# Reconnect delays grow from the min to the max, each with +-50 % jitter
+RECONNECT_MIN_DELAY = 1.0
+RECONNECT_MAX_DELAY = 60.0
+# A wall pad talks all the time, a link silent for this long is probed and
+# dead once the probe is not answered either.
+IDLE_TIMEOUT = 30
+IDLE_PROBE_TIMEOUT = 5
+WATCHDOG_INTERVAL = timedelta(seconds=5)
+# A frame failing its checksum this soon after a write collided with it.
+COLLISION_WINDOW = 0.2
+# New entities are added together once no new device showed up for this long.
+ENTITY_ADD_DELAY = 1.0
+
+# Away mode reports on its own and has no scan to poll.
+_POLL_PLATFORMS = (Platform.LIGHT, Platform.SWITCH, Platform.FAN, Platform.CLIMATE)
+# A scan of sub x0 returns the state of every device in the room.
+_ROOM_SCAN_DEVICES = (
+    Device.LIGHT,
+    Device.DIMMING,
+    Device.OUTLET,
+    Device.THERMOSTAT,
+)
+
 
 @dataclass
 class EntityData:
@@ -36,6 +103,16 @@ class EntityData:
 
     packet: ImazuPacket
     device: Entity | None = None
+    updated: float = 0.0
+
+
+@dataclass
+class _PendingCommand:
+    """A command waiting for its device to be free."""
+
+    packet: bytes
+    priority: Priority
+    future: asyncio.Future[bool]
 
 
 @dataclass
@@ -45,20 +122,39 @@ class PlatformData:
     entities: dict[str, EntityData]
 
 
-def _parse_platform(packet: ImazuPacket) -> Platform:
-    """Parse packet to platform."""
-    # This platform will be added later.
-    if isinstance(packet, AwayPacket):
-        return Platform.BINARY_SENSOR
-    if isinstance(packet, (GasPacket, OutletPacket)):
-        return Platform.SWITCH
-    if isinstance(packet, ThermostatPacket):
-        return Platform.CLIMATE
-    if isinstance(packet, (LightPacket, DimmingPacket)):
-        return Platform.LIGHT
-    if isinstance(packet, FanPacket):
-        return Platform.FAN
-    raise NotImplementedError()
+PACKET_PLATFORMS: dict[type[ImazuPacket], Platform] = {}
+
+
+def snapshot_store(hass: HomeAssistant, entry_id: str) -> Store[dict[str, str]]:
+    """Return the store of the last packet of every device of an entry."""
+    return Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}")
+
+
+def register_packet_platform(
+    packet_type: type[ImazuPacket], platform: Platform, device: Device
+) -> None:
+    """Decode the frames of a device to a packet class routed to a platform."""
+    PACKET_PLATFORMS[packet_type] = platform
+    register_packet_class(device, packet_type)
+
+
+register_packet_platform(AwayPacket, Platform.BINARY_SENSOR, Device.AWAY)
+register_packet_platform(GasPacket, Platform.SWITCH, Device.GAS)
+register_packet_platform(OutletPacket, Platform.SWITCH, Device.OUTLET)
+register_packet_platform(ThermostatPacket, Platform.CLIMATE, Device.THERMOSTAT)
+register_packet_platform(LightPacket, Platform.LIGHT, Device.LIGHT)
+register_packet_platform(DimmingPacket, Platform.LIGHT, Device.DIMMING)
+register_packet_platform(FanPacket, Platform.FAN, Device.FAN)
+
+
+def _make_poll_packets(packets: list[ImazuPacket]) -> list[bytearray]:
+    """Make the scan packets polling a group of devices in one room."""
+    packet = packets[0]
+    if len(packets) > 1 and packet.device in _ROOM_SCAN_DEVICES:
+        make_packet = packet.make_scan()
+        make_packet[4] = packet.room_id << 4
+        return [make_packet]
+    return [make_packet for p in packets if (make_packet := p.make_scan())]
 
 
 class ImazuGateway:
@@ -73,13 +169,84 @@ class ImazuGateway:
         )
         self.host: str = self._entry.data[CONF_HOST]
         self.port: int = self._entry.data[CONF_PORT]
-        self._client = ImazuClient(self.host, self.port)
-        self._client.async_packet_handler = self._async_packet_handler
+        send_interval = self._entry.options.get(
+            CONF_SEND_INTERVAL, DEFAULT_SEND_INTERVAL
+        )
+        self.optimistic: bool = self._entry.options.get(
+            CONF_OPTIMISTIC, DEFAULT_OPTIMISTIC
+        )
+        self.write_interval: int = self._entry.options.get(
+            CONF_WRITE_INTERVAL, DEFAULT_WRITE_INTERVAL
+        )
+        idle_gap = self._entry.options.get(CONF_IDLE_GAP, DEFAULT_IDLE_GAP)
+        # The first setup takes over the connection the config flow opened.
+        self._handoff: ValidatedConnection | None = async_take_connection(
+            hass, self.host, self.port
+        )
+        if self._handoff is not None:
+            self._client = self._handoff.client
+            self._client.on_link_lost = self._async_link_lost
+        else:
+            self._client = ImazuWallPadClient(
+                self.host, self.port, self._async_link_lost
+            )
+            self._client.async_receive_handler = self._async_receive_handler
+        self._client.set_intervals(send_interval / 1000, idle_gap / 1000)
+        self._frames = FrameBuffer()
+        self._last_frames: dict[bytes, bytes] = {}
+        self._unsupported: dict[int, float] = {}
+        self.metrics = BusMetrics()
+        self.polling = PollScheduler()
+        self.frame_history = FrameRing(FRAME_HISTORY_SIZE)
+        self._capture: FrameCapture | None = None
+        self._transmit = TransmitScheduler(
+            self._client,
+            self.metrics,
+            self.frame_history,
+            self._async_command_sent,
+            idle_gap / 1000,
+        )
+        self._transmit_task: asyncio.Task | None = None
+        self._reconnect_task: asyncio.Task | None = None
+        self._last_receive = time.monotonic()
+        self._probe_sent = 0.0
+        self._disconnected_at = 0.0
+        self._closing = False
+        self._link_up = False
+        self._device_callbacks: dict[str, Callable[[ImazuPacket], None]] = {}
+        self._new_entities: dict[Platform, dict[str, EntityData]] = defaultdict(dict)
+        self._new_entities_unsub: CALLBACK_TYPE | None = None
+        self._store = snapshot_store(hass, entry.entry_id)
+        # The packet of a device as the hex digits of its frame
+        self._snapshot: dict[str, list[str]] = {}
+        self._snapshot_pending = False
+        self._discovery = ImazuDiscovery(
+            self.async_send, self._async_flush_new_entities
+        )
+        self._device_locks: dict[tuple[int, int], asyncio.Lock] = defaultdict(
+            asyncio.Lock
+        )
+        self._pending_commands: dict[tuple[int, int], _PendingCommand] = {}
 
     def entity_add_signal(self, platform: Platform) -> str:
         """Return a signal for the dispatch of a device update."""
         return f"{DOMAIN}_{self.host}_{str(platform.value)}"
 
+    @property
+    def metrics_signal(self) -> str:
+        """Return a signal for the dispatch of a metrics update."""
+        return f"{DOMAIN}_{self.host}_metrics"
+
+    @property
+    def connection_signal(self) -> str:
+        """Return a signal for the dispatch of a link change."""
+        return f"{DOMAIN}_{self.host}_connection"
+
+    @property
+    def send_queue_size(self) -> int:
+        """Return the number of packets waiting for the bus."""
+        return self._transmit.queue_size
+
     async def _async_get_entity_last_packet(self, entity_id: str) -> list[ImazuPacket]:
         """Get packet data stored for an entity, if any."""
         data = restore_state.async_get(self._hass)
@@ -89,7 +256,7 @@ class ImazuGateway:
             return []
         if (packet := state.extra_data.as_dict().get(PACKET, None)) is None:
             return []
-        return parse_packet(packet)
+        return decode_frame(bytes.fromhex(packet))
 
     def _set_entity_packet(self, platform: Platform, packet: ImazuPacket) -> EntityData:
         """Get platform entity data."""
@@ -100,9 +267,10 @@ class ImazuGateway:
             data.entities[packet.device_id] = entity
         else:
             entity.packet = packet
+        entity.updated = time.monotonic()
         return entity
 
-    async def async_load_entity_registry(self) -> None:
+    async def _async_load_entity_registry(self) -> None:
         """Get entity registry and put packet data to platform entities."""
         entity_registry = er.async_get(self._hass)
         entities = er.async_entries_for_config_entry(
@@ -113,27 +281,329 @@ class ImazuGateway:
             for last_packet in imazu_packets:
                 await self._async_packet_handler(last_packet)
 
+    async def async_load_packets(self) -> None:
+        """Load the last packet of every device and put it to platform entities."""
+        await self._async_load_snapshot()
+        await self._async_take_handoff_frames()
+
+    async def _async_load_snapshot(self) -> None:
+        """Load the last packet of every device from the snapshot."""
+        if (snapshot := await self._store.async_load()) is None:
+            # Restore once from the entity registry, then keep the snapshot.
+            await self._async_load_entity_registry()
+            return
+
+        # Devices of one room share the packet, so parse each packet only once.
+        packet_devices: dict[str, set[str]] = defaultdict(set)
+        for device_id, packet in snapshot.items():
+            packet_devices[packet].add(device_id)
+
+        for packet, device_ids in packet_devices.items():
+            try:
+                imazu_packets = decode_frame(bytes.fromhex(packet))
+            except Exception as ex:  # pylint: disable=broad-except
+                _LOGGER.warning("Invalid stored packet, %s, %s", ex, packet)
+                continue
+            for last_packet in imazu_packets:
+                if last_packet.device_id in device_ids:
+                    self._snapshot[last_packet.device_id] = last_packet.packet
+                    await self._async_packet_handler(last_packet)
+
+    async def _async_take_handoff_frames(self) -> None:
+        """Handle the frames received while the config flow held the link."""
+        if (handoff := self._handoff) is None:
+            return
+        self._handoff = None
+        self._client.async_receive_handler = self._async_receive_handler
+        _LOGGER.debug("Took over the connection with %d bytes", len(handoff.frames))
+        await self._async_receive_handler(handoff.frames)
+
+    @callback
+    def _async_update_snapshot(self, packet: ImazuPacket) -> None:
+        """Keep the last packet of a device and save the snapshot later."""
+        if self._snapshot.get(packet.device_id) == packet.packet:
+            return
+        self._snapshot[packet.device_id] = packet.packet
+        self._snapshot_pending = True
+        self._store.async_delay_save(self._snapshot_data, SNAPSHOT_SAVE_DELAY)
+
+    def _snapshot_data(self) -> dict[str, str]:
+        """Return the snapshot to save, the packet of every device in hex."""
+        self._snapshot_pending = False
+        return {
+            device_id: "".join(packet) for device_id, packet in self._snapshot.items()
+        }
+
     def get_platform_entities(self, platform: Platform) -> list[EntityData]:
         """Add platform entities."""
         data = self._platforms[platform]
         return list(data.entities.values())
 
-    async def _async_packet_handler(self, packet: ImazuPacket) -> None:
-        """Client packet handler."""
-        try:
-            platform = _parse_platform(packet)
-            entity_data = self._set_entity_packet(platform, packet)
+    def _poll_groups(
+        self, stale_before: float | None = None
+    ) -> dict[tuple[Device, int], list[ImazuPacket]]:
+        """Group the added devices by device type and room.
+
+        With stale_before, only devices not updated since then are grouped.
+        """
+        groups: dict[tuple[Device, int], list[ImazuPacket]] = defaultdict(list)
+        for platform in _POLL_PLATFORMS:
+            for entity_data in self._platforms[platform].entities.values():
+                if entity_data.device is None:
+                    continue
+                if stale_before is not None and entity_data.updated >= stale_before:
+                    continue
+                packet = entity_data.packet
+                groups[(packet.device, packet.room_id)].append(packet)
+        return groups
+
+    @callback
+    def _async_queue_poll(self, packets: list[ImazuPacket]) -> None:
+        """Queue the scans polling a device group."""
+        packet = packets[0]
+        self.polling.polled(
+            (int(str(packet.device.value), 16), packet.room_id), time.monotonic()
+        )
+        for make_packet in _make_poll_packets(packets):
+            self.async_queue(make_packet, Priority.POLL)
+
+    @callback
+    def _async_poll(self, now: datetime | None = None) -> None:
+        """Poll the device groups that stayed quiet for their interval."""
+        if not self.connected:
+            return
+        monotonic = time.monotonic()
+        groups = self._poll_groups()
+        due = [
+            packets
+            for (device, room_id), packets in groups.items()
+            if self.polling.due((int(str(device.value), 16), room_id), monotonic)
+        ]
+        for packets in due:
+            self._async_queue_poll(packets)
+        if due:
+            _LOGGER.debug("Polled %d of %d device groups", len(due), len(groups))
+
+    @callback
+    def _async_resync(self, stale_before: float) -> None:
+        """Poll, in one batch, every device not updated since the link dropped.
+
+        The groups stayed quiet for the lost link, not on their own, so their
+        poll intervals are left as they are.
+        """
+        groups = self._poll_groups(stale_before)
+        for packets in groups.values():
+            for make_packet in _make_poll_packets(packets):
+                self.async_queue(make_packet, Priority.POLL)
+        _LOGGER.debug("Resync of %d device groups", len(groups))
 
-            if entity_data.device:
+    @callback
+    def async_start_polling(self) -> CALLBACK_TYPE:
+        """Check on a shared interval which device groups are due for a poll."""
+        return async_track_time_interval(
+            self._hass, self._async_poll, POLL_CHECK_INTERVAL
+        )
+
+    @callback
+    def _async_update_metrics(self, now: datetime | None = None) -> None:
+        """Compute the bus rates and notify the metric sensors."""
+        self.metrics.update()
+        async_dispatcher_send(self._hass, self.metrics_signal)
+
+    @callback
+    def _async_check_idle(self, now: datetime | None = None) -> None:
+        """Probe a link that has been silent for too long, drop it if still silent.
+
+        The probe scans a known device, any frame received after it shows the
+        link is up. Without a known device to scan, the link is dropped.
+        """
+        monotonic = time.monotonic()
+        if not self.connected or monotonic - self._last_receive <= IDLE_TIMEOUT:
+            return
+        if self._probe_sent > self._last_receive:
+            if monotonic - self._probe_sent > IDLE_PROBE_TIMEOUT:
+                self._async_link_lost("probe of the silent link unanswered")
+            return
+        probe = next(
+            (
+                make_packet
+                for packets in self._poll_groups().values()
+                for make_packet in _make_poll_packets(packets)
+            ),
+            None,
+        )
+        if probe is None:
+            self._async_link_lost(f"no frame for {IDLE_TIMEOUT} s")
+            return
+        _LOGGER.debug("No frame for %d s, probing the link", IDLE_TIMEOUT)
+        self._probe_sent = monotonic
+        self.async_queue(probe)
+
+    @callback
+    def async_start_watchdog(self) -> CALLBACK_TYPE:
+        """Check the link for silence on a shared interval."""
+        return async_track_time_interval(
+            self._hass, self._async_check_idle, WATCHDOG_INTERVAL
+        )
+
+    @callback
+    def async_start_metrics(self) -> CALLBACK_TYPE:
+        """Update the bus metrics on a shared interval."""
+        return async_track_time_interval(
+            self._hass, self._async_update_metrics, METRICS_INTERVAL
+        )
+
+    @callback
+    def async_register_device(
+        self, device_id: str, update_callback: Callable[[ImazuPacket], None]
+    ) -> CALLBACK_TYPE:
+        """Register the packet update callback of a device entity."""
+        self._device_callbacks[device_id] = update_callback
+
+        @callback
+        def _async_unregister() -> None:
+            if self._device_callbacks.get(device_id) is update_callback:
+                del self._device_callbacks[device_id]
+
+        return _async_unregister
+
+    @callback
+    def _async_schedule_entity_add(
+        self, platform: Platform, entity_data: EntityData
+    ) -> None:
+        """Buffer a new entity until discovery settles."""
+        self._new_entities[platform][entity_data.packet.device_id] = entity_data
+        if self._new_entities_unsub is not None:
+            self._new_entities_unsub()
+        self._new_entities_unsub = async_call_later(
+            self._hass, ENTITY_ADD_DELAY, self._async_flush_new_entities
+        )
+
+    @callback
+    def _async_flush_new_entities(self, now: datetime | None = None) -> None:
+        """Dispatch the buffered entities, one batch per platform."""
+        if self._new_entities_unsub is not None:
+            self._new_entities_unsub()
+            self._new_entities_unsub = None
+        new_entities, self._new_entities = self._new_entities, defaultdict(dict)
+        for platform, entities in new_entities.items():
+            if entity_list := [e for e in entities.values() if e.device is None]:
                 async_dispatcher_send(
-                    self._hass, f"{DOMAIN}_{self.host}_{packet.device_id}", packet
+                    self._hass, self.entity_add_signal(platform), entity_list
                 )
-            else:
-                async_dispatcher_send(
-                    self._hass, self.entity_add_signal(platform), entity_data
+
+    async def _async_receive_handler(self, data: bytes) -> None:
+        """Decode the received frames, dropping repeats of the last frame."""
+        self._last_receive = time.monotonic()
+        frames = self._frames.feed(data)
+        self._transmit.bus_activity(self._last_receive, self._frames.partial)
+        for frame in frames:
+            self.metrics.frame_received(frame)
+            self.frame_history.append(frame, False)
+            if self._capture is not None:
+                self._capture.append(frame)
+            if not valid_frame(frame):
+                self.metrics.parse_failures += 1
+                if self._last_receive - self._transmit.last_sent < COLLISION_WINDOW:
+                    self.metrics.collisions += 1
+                _LOGGER.debug("receive invalid checksum: %s", frame.hex())
+                continue
+            # f7, len, 01 or 1a, device, cmd, value_type, sub, ...
+            if status_frame(frame):
+                self.polling.frame_received(
+                    (frame[3], frame_sub(frame) >> 4), self._last_receive
                 )
-        except NotImplementedError:
-            _LOGGER.warning("This device is not supported, %s", packet.description())
+            if frame[3] in self._unsupported or not known_device(frame[3]):
+                self._async_drop_unsupported(frame)
+                continue
+            key = frame[3:7]
+            if self._last_frames.get(key) == frame:
+                self.metrics.duplicate_frames += 1
+                continue
+            self._last_frames[key] = frame
+            try:
+                packets = decode_frame(frame)
+            except Exception as ex:  # pylint: disable=broad-except
+                self.metrics.parse_failures += 1
+                _LOGGER.error("frame decode error, %s, %s", ex, frame.hex())
+                continue
+            try:
+                for packet in packets:
+                    await self._async_packet_handler(packet)
+            except Exception as ex:  # pylint: disable=broad-except
+                _LOGGER.error("packets handler error, %s, %s", ex, frame.hex())
+
+    @callback
+    def _async_command_sent(self, packet: bytes) -> None:
+        """Expect the answer of a command, it is no report of the device."""
+        # 01 or 1a, device, cmd, value_type, sub, change_value, state_value
+        self.polling.solicited((packet[1], packet[4] >> 4), time.monotonic())
+        self._async_forget_frames(packet)
+
+    @callback
+    def _async_forget_frames(self, packet: bytes) -> None:
+        """Let the next frames of a device through, as they answer a command."""
+        # 01 or 1a, device, cmd, value_type, sub, change_value, state_value
+        device = packet[1]
+        for key in [key for key in self._last_frames if key[0] == device]:
+            del self._last_frames[key]
+
+    @callback
+    def _async_drop_unsupported(self, frame: bytes) -> None:
+        """Count a frame of an unsupported device, logging it once in a while."""
+        self.metrics.unsupported_frames += 1
+        now = time.monotonic()
+        if now - self._unsupported.get(frame[3], 0.0) >= UNSUPPORTED_LOG_INTERVAL:
+            self._unsupported[frame[3]] = now
+            _LOGGER.debug("This device is not supported, drop %s", frame.hex())
+
+    async def _async_packet_handler(
+        self, packet: ImazuPacket, replay: bool = False
+    ) -> None:
+        """Client packet handler.
+
+        A replayed packet answers no command and is not kept in the snapshot.
+        """
+        if not replay:
+            self._transmit.packet_received(packet)
+        # Only frames of registered devices are decoded.
+        platform = PACKET_PLATFORMS[type(packet)]
+        entity_data = self._set_entity_packet(platform, packet)
+        if not replay:
+            self._async_update_snapshot(packet)
+        self._discovery.async_packet_received(packet)
+
+        if entity_data.device is None:
+            self._async_schedule_entity_add(platform, entity_data)
+        elif update_callback := self._device_callbacks.get(packet.device_id):
+            update_callback(packet)
+
+    @property
+    def capture_path(self) -> Path | None:
+        """Return the file received frames are captured to, if any."""
+        return self._capture.path if self._capture is not None else None
+
+    async def async_start_capture(self, path: Path) -> None:
+        """Capture every received frame to a new file."""
+        await self.async_stop_capture()
+        capture = FrameCapture(self._hass, path)
+        await capture.async_start()
+        self._capture = capture
+
+    async def async_stop_capture(self) -> None:
+        """Stop capturing and write the buffered frames."""
+        if (capture := self._capture) is not None:
+            self._capture = None
+            await capture.async_stop()
+
+    async def async_replay(self, path: Path, realtime: bool = False) -> int:
+        """Feed a capture to the packet handler, return the frame count."""
+        return await async_replay_capture(
+            self._hass,
+            path,
+            partial(self._async_packet_handler, replay=True),
+            realtime,
+        )
 
     @property
     def connected(self) -> bool:
@@ -141,18 +611,144 @@ class ImazuGateway:
         return self._client.connected
 
     async def async_connect(self) -> bool:
-        """Connect."""
-        return await self._client.async_connect()
+        """Connect, unless the link taken over from the config flow is up."""
+        if not self._client.connected and not await self._client.async_connect():
+            return False
+        self._last_receive = time.monotonic()
+        self._transmit.set_connected(True)
+        self._async_set_link_up(True)
+        if self._transmit_task is None:
+            self._transmit_task = self._hass.async_create_background_task(
+                self._transmit.async_run(), f"{DOMAIN}_{self.host}_transmit"
+            )
+        return True
+
+    async def _async_connect_with_backoff(self) -> None:
+        """Connect, retrying with a jittered exponential backoff."""
+        delay = RECONNECT_MIN_DELAY
+        while not await self.async_connect():
+            await asyncio.sleep(delay * random.uniform(0.5, 1.5))
+            delay = min(delay * 2, RECONNECT_MAX_DELAY)
+
+    async def async_start(self) -> None:
+        """Connect in the background, retrying until the link is up."""
+        await self._async_connect_with_backoff()
+        await self._discovery.async_discover()
 
-    async def async_send(self, packet: bytes):
-        """Socket send packet."""
-        await self._client.async_send(packet)
+    @callback
+    def _async_link_lost(self, reason: str) -> None:
+        """Drop the link and reconnect in the background."""
+        if self._closing or self._reconnect_task is not None or not self.connected:
+            return
+        _LOGGER.warning("Connection to %s lost, %s", self.host, reason)
+        self.metrics.disconnects += 1
+        self._disconnected_at = time.monotonic()
+        self._transmit.set_connected(False)
+        self._client.disconnect()
+        self._async_set_link_up(False)
+        self._reconnect_task = self._entry.async_create_background_task(
+            self._hass, self._async_reconnect(), f"{DOMAIN}_{self.host}_reconnect"
+        )
 
-    async def async_send_wait(self, packet: bytes):
-        """Socket send packet and wait response."""
-        await self._client.async_send_wait(packet)
+    async def _async_reconnect(self) -> None:
+        """Reconnect, then poll the devices that went stale meanwhile."""
+        try:
+            await self._async_connect_with_backoff()
+        finally:
+            self._reconnect_task = None
+        recovery_time = time.monotonic() - self._disconnected_at
+        self.metrics.recovery_time = round(recovery_time, 1)
+        _LOGGER.info("Reconnected to %s after %.1f s", self.host, recovery_time)
+        self._async_resync(self._disconnected_at)
+
+    @callback
+    def async_add_scan_packets(self, packets: list[str]) -> None:
+        """Add scan packets used to discover the devices of a platform."""
+        self._discovery.async_add_scan_packets(packets)
+
+    async def async_discover(self, rescan: bool = False) -> None:
+        """Discover devices, rescan asks again every room that never answered."""
+        await self._discovery.async_discover(rescan)
+
+    @callback
+    def _async_set_link_up(self, link_up: bool) -> None:
+        """Tell the devices once that the link went up or down."""
+        if link_up == self._link_up:
+            return
+        self._link_up = link_up
+        async_dispatcher_send(self._hass, self.connection_signal, link_up)
+
+    @callback
+    def async_queue(self, packet: bytes, priority: Priority = Priority.POLL) -> None:
+        """Queue a packet without waiting for it to be sent."""
+        # 01 or 1a, device, cmd, value_type, sub, change_value, state_value
+        self.polling.solicited((packet[1], packet[4] >> 4), time.monotonic())
+        self._transmit.queue(packet, priority)
+
+    async def async_send(self, packet: bytes, priority: Priority = Priority.POLL):
+        """Socket send packet, raise ConnectionError if it was not sent."""
+        self.polling.solicited((packet[1], packet[4] >> 4), time.monotonic())
+        await self._transmit.async_send(packet, priority)
+
+    async def async_send_wait(
+        self, packet: bytes, priority: Priority = Priority.COMMAND
+    ) -> bool:
+        """Socket send packet and wait response, return False if none came.
+
+        A command is merged into the last command still waiting for the same
+        device when both change the same value type, so only the newest is sent.
+        """
+        # 01 or 1a, device, cmd, value_type, sub, change_value, state_value
+        key = (packet[1], packet[4])
+        pending = self._pending_commands.get(key)
+        if pending is not None and pending.packet[3] == packet[3]:
+            pending.packet = packet
+            pending.priority = min(pending.priority, priority)
+        else:
+            pending = _PendingCommand(
+                packet, priority, self._hass.loop.create_future()
+            )
+            self._pending_commands[key] = pending
+            self._hass.async_create_background_task(
+                self._async_send_pending(key, pending),
+                f"{DOMAIN}_{self.host}_send_{packet.hex()}",
+            )
+        return await asyncio.shield(pending.future)
+
+    async def _async_send_pending(
+        self, key: tuple[int, int], pending: _PendingCommand
+    ) -> None:
+        """Send a pending command once its device is free."""
+        async with self._device_locks[key]:
+            if self._pending_commands.get(key) is pending:
+                del self._pending_commands[key]
+            try:
+                result = await self._transmit.async_request(
+                    pending.packet, pending.priority
+                )
+            except Exception as ex:  # pylint: disable=broad-except
+                pending.future.set_exception(ex)
+            else:
+                pending.future.set_result(result)
 
     async def async_close(self) -> None:
         """Close Gateway."""
+        self._closing = True
+        if self._reconnect_task is not None:
+            self._reconnect_task.cancel()
+            self._reconnect_task = None
+        if self._new_entities_unsub is not None:
+            self._new_entities_unsub()
+            self._new_entities_unsub = None
+        # Fail what is queued or awaiting an answer, nobody would send it now.
+        self._transmit.set_connected(False)
+        if self._transmit_task is not None:
+            self._transmit_task.cancel()
+            self._transmit_task = None
+        await self.async_stop_capture()
+        # Save now rather than later, when the entry may have been removed.
+        if self._snapshot_pending:
+            await self._store.async_save(self._snapshot_data())
         self._client.disconnect()
         self._platforms.clear()
+        self._last_frames.clear()
@@ -0,0 +1,143 @@
+"""Hand off of the connection validated by the config flow."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from datetime import datetime
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+from .client import ImazuWallPadClient
+from .const import DEFAULT_IDLE_GAP, DEFAULT_SEND_INTERVAL, DOMAIN
+from .discovery import DISCOVERY_RESPONSE_TIMEOUT
+from .frame import PACKET_TAIL
+from .transmit import PARTIAL_FRAME_TIMEOUT
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_HANDOFF = f"{DOMAIN}_handoff"
+# Seconds a validated connection waits for the setup before it is closed
+HANDOFF_TTL = 60
+# The newest bytes received while waiting that are kept for the setup
+HANDOFF_BUFFER_SIZE = 64 * 1024
+
+
+class ValidatedConnection:
+    """A connection opened by the config flow, kept for the first setup.
+
+    The wall pad accepts only a few TCP clients, so the setup takes over the
+    connection instead of opening a new one, along with the frames received
+    meanwhile, the answers to a round of scans included.
+    """
+
+    def __init__(self, hass: HomeAssistant, host: str, port: int) -> None:
+        """Initialize the validated connection."""
+        self._hass = hass
+        self.host = host
+        self.port = port
+        self.client = ImazuWallPadClient(
+            host,
+            port,
+            self._async_link_lost,
+            send_packet_interval=DEFAULT_SEND_INTERVAL / 1000,
+        )
+        self.client.async_receive_handler = self._async_receive_handler
+        self.frames = bytearray()
+        self._last_activity = 0.0
+        self._last_sent = 0.0
+        self._unsub: CALLBACK_TYPE | None = None
+
+    async def _async_receive_handler(self, data: bytes) -> None:
+        """Keep the received bytes for the setup, dropping the oldest."""
+        self._last_activity = time.monotonic()
+        self.frames += data
+        if (excess := len(self.frames) - HANDOFF_BUFFER_SIZE) > 0:
+            del self.frames[:excess]
+
+    def _idle_wait(self, now: float) -> float:
+        """Return the seconds until a scan may be written.
+
+        The scans are paced as the transmit scheduler paces them, after the
+        idle gap on the bus and the send interval of the client.
+        """
+        gap = DEFAULT_IDLE_GAP / 1000
+        if self.frames and not self.frames.endswith(PACKET_TAIL):
+            gap = max(gap, PARTIAL_FRAME_TIMEOUT)
+        return max(
+            max(self._last_activity, self._last_sent) + gap,
+            self._last_sent + self.client.send_interval,
+        ) - now
+
+    @callback
+    def _async_link_lost(self, reason: str) -> None:
+        """Forget a connection that dropped before the setup took it."""
+        _LOGGER.debug("Validated connection to %s lost, %s", self.host, reason)
+        connections = self._hass.data.get(DATA_HANDOFF, {})
+        if connections.get((self.host, self.port)) is self:
+            del connections[(self.host, self.port)]
+        self.close()
+
+    async def async_connect(self) -> bool:
+        """Connect, return False if the wall pad cannot be reached."""
+        if await self.client.async_connect():
+            return True
+        self.client.disconnect()
+        return False
+
+    async def async_scan(self, packets: list[str]) -> None:
+        """Send one round of scans and wait for their answers."""
+        for packet in packets:
+            while (delay := self._idle_wait(time.monotonic())) > 0:
+                await asyncio.sleep(delay)
+            if not await self.client.async_send(bytes.fromhex(packet)):
+                _LOGGER.debug("Scan %s not sent", packet)
+                continue
+            self._last_sent = time.monotonic()
+        await asyncio.sleep(DISCOVERY_RESPONSE_TIMEOUT)
+
+    @callback
+    def async_hand_off(self) -> None:
+        """Keep the connection for the setup, closing it if unused for long."""
+        if not self.client.connected:
+            return
+        connections = self._hass.data.setdefault(DATA_HANDOFF, {})
+        if (other := connections.pop((self.host, self.port), None)) is not None:
+            other.close()
+        connections[(self.host, self.port)] = self
+
+        @callback
+        def _async_expire(now: datetime) -> None:
+            self._unsub = None
+            _LOGGER.debug("Validated connection to %s unused", self.host)
+            if connections.get((self.host, self.port)) is self:
+                del connections[(self.host, self.port)]
+            self.close()
+
+        self._unsub = async_call_later(self._hass, HANDOFF_TTL, _async_expire)
+
+    @callback
+    def async_cancel_expiry(self) -> None:
+        """Keep the connection open past its expiry."""
+        if self._unsub is not None:
+            self._unsub()
+            self._unsub = None
+
+    def close(self) -> None:
+        """Close the connection."""
+        self.async_cancel_expiry()
+        self.client.disconnect()
+
+
+@callback
+def async_take_connection(
+    hass: HomeAssistant, host: str, port: int
+) -> ValidatedConnection | None:
+    """Return the connection validated for a host and stop its expiry."""
+    connections: dict[tuple[str, int], ValidatedConnection] = hass.data.get(
+        DATA_HANDOFF, {}
+    )
+    if (connection := connections.pop((host, port), None)) is not None:
+        connection.async_cancel_expiry()
+    return connection
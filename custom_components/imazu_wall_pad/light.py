@@ -10,26 +10,10 @@ from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from wp_imazu.packet import LightPacket, DimmingPacket
 
 from . import ImazuGateway, ImazuWallPadConfigEntry
+from .const import SCAN_LIGHT_PACKETS
 from .gateway import EntityData
 from .wall_pad import WallPadDevice
 
-SCAN_LIGHT_PACKETS = [
-    # Light
-    "01190140100000",
-    "01190140200000",
-    "01190140300000",
-    "01190140400000",
-    "01190140500000",
-    "01190140600000",
-    # Dimmer
-    "011a0142100000",
-    "011a0142200000",
-    "011a0142300000",
-    "011a0142400000",
-    "011a0142500000",
-    "011a0142600000",
-]
-
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -40,27 +24,32 @@ async def async_setup_entry(
     gateway: ImazuGateway = entry.runtime_data
 
     @callback
-    def async_add_entity(entity_data: EntityData):
-        if isinstance(entity_data.packet, LightPacket):
-            entity_data.device = WPLight(gateway, Platform.LIGHT, entity_data.packet)
-            async_add_entities([entity_data.device])
-        elif isinstance(entity_data.packet, DimmingPacket):
-            entity_data.device = WPDimmer(gateway, Platform.LIGHT, entity_data.packet)
-            async_add_entities([entity_data.device])
+    def async_add_entity(entities: list[EntityData]):
+        devices = []
+        for entity_data in entities:
+            if isinstance(entity_data.packet, LightPacket):
+                entity_data.device = WPLight(
+                    gateway, Platform.LIGHT, entity_data.packet
+                )
+            elif isinstance(entity_data.packet, DimmingPacket):
+                entity_data.device = WPDimmer(
+                    gateway, Platform.LIGHT, entity_data.packet
+                )
+            else:
+                continue
+            devices.append(entity_data.device)
+        if devices:
+            async_add_entities(devices)
 
     entities = gateway.get_platform_entities(Platform.LIGHT)
-    for data in entities:
-        async_add_entity(data)
+    async_add_entity(entities)
 
     entry.async_on_unload(
         async_dispatcher_connect(
             hass, gateway.entity_add_signal(Platform.LIGHT), async_add_entity
         )
     )
-
-    if len(entities) == 0:
-        for packet in SCAN_LIGHT_PACKETS:
-            await gateway.async_send(bytes.fromhex(packet))
+    gateway.async_add_scan_packets(SCAN_LIGHT_PACKETS)
 
 
 class WPLight(WallPadDevice[LightPacket], LightEntity):
@@ -72,17 +61,21 @@ class WPLight(WallPadDevice[LightPacket], LightEntity):
     @property
     def is_on(self) -> bool:
         """Return true if light is on."""
-        return self.packet.state["power"] == LightPacket.Power.ON
+        return self.packet_state["power"] == LightPacket.Power.ON
 
     async def async_turn_on(self, **kwargs: Any) -> None:
         """Turn on light."""
         make_packet = self.packet.make_change_power(LightPacket.Power.ON)
-        await super().async_send_packet(make_packet)
+        await super().async_send_packet(
+            make_packet, expected_state={"power": LightPacket.Power.ON}
+        )
 
     async def async_turn_off(self, **kwargs: Any) -> None:
         """Turn off light."""
         make_packet = self.packet.make_change_power(LightPacket.Power.OFF)
-        await super().async_send_packet(make_packet)
+        await super().async_send_packet(
+            make_packet, expected_state={"power": LightPacket.Power.OFF}
+        )
 
 
 class WPDimmer(WallPadDevice[DimmingPacket], LightEntity):
@@ -95,27 +88,29 @@ class WPDimmer(WallPadDevice[DimmingPacket], LightEntity):
     def is_on(self) -> bool:
         """Return true if light is on."""
         return (
-            "brightness" in self.packet.state and self.packet.state["brightness"] != 0
+            "brightness" in self.packet_state and self.packet_state["brightness"] != 0
         )
 
     @property
     def brightness(self) -> int:
         """Return the brightness of this light between 0..255."""
-        if "brightness" not in self.packet.state:
+        if "brightness" not in self.packet_state:
             return 0
-        return round(self.packet.state["brightness"] * 255 / 3)
+        return round(self.packet_state["brightness"] * 255 / 3)
 
     async def async_turn_on(self, **kwargs: Any) -> None:
         """Turn on light."""
         if ATTR_BRIGHTNESS in kwargs:
             brightness = round(kwargs[ATTR_BRIGHTNESS] * 3 / 255)
-            make_packet = self.packet.make_change_brightness(brightness)
         else:
-            make_packet = self.packet.make_change_brightness(3)
+            brightness = 3
+        make_packet = self.packet.make_change_brightness(brightness)
 
-        await super().async_send_packet(make_packet)
+        await super().async_send_packet(
+            make_packet, expected_state={"brightness": brightness}
+        )
 
     async def async_turn_off(self, **kwargs: Any) -> None:
         """Turn off light."""
         make_packet = self.packet.make_change_brightness(0)
-        await super().async_send_packet(make_packet)
+        await super().async_send_packet(make_packet, expected_state={"brightness": 0})
@@ -0,0 +1,93 @@
+"""Bus metrics of Wall Pad."""
+
+from __future__ import annotations
+
+import time
+from collections import deque
+
+BAUD_RATE = 9600
+BITS_PER_BYTE = 10  # start bit, 8 data bits, stop bit
+ROUND_TRIP_SAMPLES = 200
+
+
+class BusMetrics:
+    """Counters and timings of the RS485 bus."""
+
+    def __init__(self) -> None:
+        """Initialize the bus metrics."""
+        self.frames_received = 0
+        self.frames_sent = 0
+        self.parse_failures = 0
+        self.duplicate_frames = 0
+        self.unsupported_frames = 0
+        self.disconnects = 0
+        self.collisions = 0
+        self.retries = 0
+        self.recovery_time: float | None = None
+        self.receive_rate = 0.0
+        self.send_rate = 0.0
+        self.bus_utilization = 0.0
+        self._round_trips: deque[float] = deque(maxlen=ROUND_TRIP_SAMPLES)
+        self._bytes = 0
+        self._last_update = time.monotonic()
+        self._last_received = 0
+        self._last_sent = 0
+
+    def frame_received(self, frame: bytes) -> None:
+        """Count a frame read from the bus."""
+        self.frames_received += 1
+        self._bytes += len(frame)
+
+    def frame_sent(self, frame: bytes) -> None:
+        """Count a frame written to the bus."""
+        self.frames_sent += 1
+        self._bytes += len(frame)
+
+    def round_trip(self, seconds: float) -> None:
+        """Add the time between sending a packet and its answer."""
+        self._round_trips.append(seconds)
+
+    def round_trip_percentile(self, percentile: int) -> float | None:
+        """Return a round trip time percentile in milliseconds."""
+        if not self._round_trips:
+            return None
+        samples = sorted(self._round_trips)
+        index = min(len(samples) - 1, len(samples) * percentile // 100)
+        return round(samples[index] * 1000, 1)
+
+    def as_dict(self) -> dict[str, float | int | None]:
+        """Return the metrics as a dict."""
+        return {
+            "frames_received": self.frames_received,
+            "frames_sent": self.frames_sent,
+            "parse_failures": self.parse_failures,
+            "duplicate_frames": self.duplicate_frames,
+            "unsupported_frames": self.unsupported_frames,
+            "disconnects": self.disconnects,
+            "collisions": self.collisions,
+            "retries": self.retries,
+            "recovery_time": self.recovery_time,
+            "receive_rate": self.receive_rate,
+            "send_rate": self.send_rate,
+            "bus_utilization": self.bus_utilization,
+            "round_trip_p50": self.round_trip_percentile(50),
+            "round_trip_p95": self.round_trip_percentile(95),
+            "round_trip_max": self.round_trip_percentile(100),
+        }
+
+    def update(self) -> None:
+        """Compute the rates since the last update."""
+        now = time.monotonic()
+        if (elapsed := now - self._last_update) <= 0:
+            return
+        self.receive_rate = round(
+            (self.frames_received - self._last_received) / elapsed, 2
+        )
+        self.send_rate = round((self.frames_sent - self._last_sent) / elapsed, 2)
+        self.bus_utilization = round(
+            min(100.0, self._bytes * BITS_PER_BYTE / BAUD_RATE / elapsed * 100), 1
+        )
+        self._bytes = 0
+        self._last_update = now
+        self._last_received = self.frames_received
+        self._last_sent = self.frames_sent
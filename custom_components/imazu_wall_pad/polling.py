@@ -0,0 +1,79 @@
+"""Adaptive polling of Wall Pad devices."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+# Poll interval of a device group, in seconds, before anything was learned
+POLL_DEFAULT_INTERVAL = 90.0
+# A group that stays quiet is polled down to this interval
+POLL_MIN_INTERVAL = 60.0
+# A group that reports on its own is polled up to this interval
+POLL_MAX_INTERVAL = 600.0
+# A frame within this many seconds of a scan or command answers it
+ANSWER_WINDOW = 10.0
+
+
+@dataclass
+class _GroupPoll:
+    """What was learned about a group of devices of one type in one room."""
+
+    interval: float = POLL_DEFAULT_INTERVAL
+    received: float = 0.0
+    solicited: float = 0.0
+    reports: int = 0
+
+
+class PollScheduler:
+    """Decides which device groups to poll from the frames they send.
+
+    A frame nobody asked for shows the group reports its changes on its own,
+    so its poll interval doubles. A poll needed because the group stayed quiet
+    halves it. A group is not polled while its last frame is still fresh.
+    Groups are keyed by the device byte and the room.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the poll scheduler."""
+        self._groups: dict[tuple[int, int], _GroupPoll] = {}
+
+    def _group(self, key: tuple[int, int]) -> _GroupPoll:
+        """Return the group of a key, added on first use."""
+        if (group := self._groups.get(key)) is None:
+            group = self._groups[key] = _GroupPoll()
+        return group
+
+    def frame_received(self, key: tuple[int, int], now: float) -> None:
+        """Learn from a frame of a group."""
+        group = self._group(key)
+        group.received = now
+        if now - group.solicited > ANSWER_WINDOW:
+            group.reports += 1
+            group.interval = min(group.interval * 2, POLL_MAX_INTERVAL)
+
+    def solicited(self, key: tuple[int, int], now: float) -> None:
+        """Note a scan or command sent to a group, its answer is no report."""
+        self._group(key).solicited = now
+
+    def due(self, key: tuple[int, int], now: float) -> bool:
+        """Return True if a group has been quiet for its whole interval."""
+        group = self._group(key)
+        last = max(group.received, group.solicited)
+        return now - last >= group.interval
+
+    def polled(self, key: tuple[int, int], now: float) -> None:
+        """Note a poll of a quiet group and poll it sooner next time."""
+        group = self._group(key)
+        group.solicited = now
+        group.interval = max(group.interval / 2, POLL_MIN_INTERVAL)
+
+    def as_dict(self) -> dict[str, dict[str, float | int]]:
+        """Return the learned interval and report count of every group heard."""
+        return {
+            f"{device:02x}_{room}": {
+                "interval": group.interval,
+                "reports": group.reports,
+            }
+            for (device, room), group in self._groups.items()
+            if group.received
+        }
@@ -0,0 +1,176 @@
+"""Sensor platform for Imazu Wall Pad integration."""
+
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorEntityDescription,
+    SensorStateClass,
+)
+from homeassistant.const import PERCENTAGE, EntityCategory, UnitOfTime
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+from homeassistant.helpers.entity import DeviceInfo
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.typing import StateType
+from . import ImazuGateway, ImazuWallPadConfigEntry
+from .const import BRAND_NAME, DOMAIN
+from .helper import host_to_last
+
+
+@dataclass(frozen=True, kw_only=True)
+class WPBusSensorEntityDescription(SensorEntityDescription):
+    """Describes a Wall Pad bus sensor."""
+
+    value_fn: Callable[[ImazuGateway], StateType]
+
+
+BUS_SENSORS: tuple[WPBusSensorEntityDescription, ...] = (
+    WPBusSensorEntityDescription(
+        key="receive_rate",
+        name="Receive rate",
+        icon="mdi:download-network",
+        native_unit_of_measurement="frames/s",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda gateway: gateway.metrics.receive_rate,
+    ),
+    WPBusSensorEntityDescription(
+        key="send_rate",
+        name="Send rate",
+        icon="mdi:upload-network",
+        native_unit_of_measurement="frames/s",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda gateway: gateway.metrics.send_rate,
+    ),
+    WPBusSensorEntityDescription(
+        key="parse_failures",
+        name="Parse failures",
+        icon="mdi:alert-circle-outline",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda gateway: gateway.metrics.parse_failures,
+    ),
+    WPBusSensorEntityDescription(
+        key="unsupported_frames",
+        name="Unsupported frames",
+        icon="mdi:help-network-outline",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda gateway: gateway.metrics.unsupported_frames,
+    ),
+    WPBusSensorEntityDescription(
+        key="duplicate_frames",
+        name="Duplicate frames",
+        icon="mdi:content-duplicate",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda gateway: gateway.metrics.duplicate_frames,
+    ),
+    WPBusSensorEntityDescription(
+        key="collisions",
+        name="Collisions",
+        icon="mdi:call-merge",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda gateway: gateway.metrics.collisions,
+    ),
+    WPBusSensorEntityDescription(
+        key="retries",
+        name="Retries",
+        icon="mdi:repeat",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda gateway: gateway.metrics.retries,
+    ),
+    WPBusSensorEntityDescription(
+        key="send_queue",
+        name="Send queue",
+        icon="mdi:tray-full",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda gateway: gateway.send_queue_size,
+    ),
+    WPBusSensorEntityDescription(
+        key="round_trip_p50",
+        name="Round trip p50",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda gateway: gateway.metrics.round_trip_percentile(50),
+    ),
+    WPBusSensorEntityDescription(
+        key="round_trip_p95",
+        name="Round trip p95",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda gateway: gateway.metrics.round_trip_percentile(95),
+    ),
+    WPBusSensorEntityDescription(
+        key="disconnects",
+        name="Disconnects",
+        icon="mdi:lan-disconnect",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda gateway: gateway.metrics.disconnects,
+    ),
+    WPBusSensorEntityDescription(
+        key="recovery_time",
+        name="Recovery time",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        value_fn=lambda gateway: gateway.metrics.recovery_time,
+    ),
+    WPBusSensorEntityDescription(
+        key="bus_utilization",
+        name="Bus utilization",
+        icon="mdi:gauge",
+        native_unit_of_measurement=PERCENTAGE,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda gateway: gateway.metrics.bus_utilization,
+    ),
+)
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    entry: ImazuWallPadConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Initialize Imazu Wall Pad config entry."""
+    gateway: ImazuGateway = entry.runtime_data
+
+    async_add_entities(
+        WPBusSensor(gateway, description) for description in BUS_SENSORS
+    )
+
+
+class WPBusSensor(SensorEntity):
+    """Representation of a Wall Pad bus diagnostic sensor."""
+
+    _attr_should_poll = False
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    entity_description: WPBusSensorEntityDescription
+
+    def __init__(
+        self, gateway: ImazuGateway, description: WPBusSensorEntityDescription
+    ) -> None:
+        """Initialize the instance."""
+        self.gateway = gateway
+        self.entity_description = description
+        self.entity_id = (
+            f"sensor.{BRAND_NAME}_{host_to_last(self.gateway.host)}_{description.key}"
+        )
+        self._attr_unique_id = (
+            f"{BRAND_NAME}_{host_to_last(self.gateway.host)}_{description.key}"
+        )
+        self._attr_name = f"{BRAND_NAME} {description.name}".title()
+        self._attr_device_info = DeviceInfo(identifiers={(DOMAIN, self.gateway.host)})
+
+    @property
+    def native_value(self) -> StateType:
+        """Return the value of the sensor."""
+        return self.entity_description.value_fn(self.gateway)
+
+    async def async_added_to_hass(self) -> None:
+        """Register metrics update callback."""
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass, self.gateway.metrics_signal, self.async_write_ha_state
+            )
+        )
@@ -0,0 +1,334 @@
+"""Services for the Imazu Wall Pad integration."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import voluptuous as vol
+from wp_imazu.packet import Device
+
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.const import ATTR_ENTITY_ID, ATTR_TEMPERATURE, Platform
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.exceptions import ServiceValidationError
+import homeassistant.helpers.config_validation as cv
+from homeassistant.util import dt as dt_util
+from .capture import CAPTURE_SUFFIX
+from .const import ATTR_ROOM_ID, DOMAIN, MODE_AWAY, MODE_HEAT, MODE_OFF
+
+if TYPE_CHECKING:
+    from .climate import WPClimate
+    from .gateway import ImazuGateway
+    from .wall_pad import WallPadDevice
+
+SERVICE_RESCAN = "rescan"
+SERVICE_START_CAPTURE = "start_capture"
+SERVICE_STOP_CAPTURE = "stop_capture"
+SERVICE_REPLAY_CAPTURE = "replay_capture"
+SERVICE_SET_POWER = "set_power"
+SERVICE_SET_HEATING = "set_heating"
+
+ATTR_FILENAME = "filename"
+ATTR_REALTIME = "realtime"
+ATTR_POWER = "power"
+ATTR_DEVICE_TYPE = "device_type"
+ATTR_ROOMS = "rooms"
+ATTR_PRESET_MODE = "preset_mode"
+
+POWER_DEVICES = {
+    "light": Device.LIGHT,
+    "dimming": Device.DIMMING,
+    "outlet": Device.OUTLET,
+    "fan": Device.FAN,
+}
+_POWER_PLATFORMS = (Platform.LIGHT, Platform.SWITCH, Platform.FAN)
+
+_FILENAME = vol.All(cv.string, vol.Match(r"^[\w.-]+$"))
+
+START_CAPTURE_SCHEMA = vol.Schema({vol.Optional(ATTR_FILENAME): _FILENAME})
+REPLAY_CAPTURE_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_FILENAME): _FILENAME,
+        vol.Optional(ATTR_REALTIME, default=False): cv.boolean,
+    }
+)
+
+SET_POWER_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_POWER): cv.boolean,
+        vol.Optional(ATTR_ROOM_ID): vol.All(vol.Coerce(int), vol.Range(min=1, max=15)),
+        vol.Optional(ATTR_DEVICE_TYPE): vol.All(
+            cv.ensure_list, [vol.In(POWER_DEVICES)]
+        ),
+        vol.Optional(ATTR_ENTITY_ID): cv.entity_ids,
+    }
+)
+
+SET_HEATING_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_ROOMS): vol.All(
+            cv.ensure_list,
+            [
+                vol.All(
+                    {
+                        vol.Required(ATTR_ENTITY_ID): cv.entity_id,
+                        vol.Optional(ATTR_TEMPERATURE): vol.All(
+                            vol.Coerce(int), vol.Range(min=5, max=35)
+                        ),
+                        vol.Optional(ATTR_PRESET_MODE): vol.In(
+                            [MODE_OFF, MODE_HEAT, MODE_AWAY]
+                        ),
+                    },
+                    cv.has_at_least_one_key(ATTR_TEMPERATURE, ATTR_PRESET_MODE),
+                )
+            ],
+        ),
+    }
+)
+
+
+@callback
+def _async_get_gateways(hass: HomeAssistant) -> list[ImazuGateway]:
+    """Return the gateways of every loaded config entry."""
+    return [
+        entry.runtime_data
+        for entry in hass.config_entries.async_entries(DOMAIN)
+        if entry.state is ConfigEntryState.LOADED
+    ]
+
+
+@callback
+def _async_get_power_devices(
+    gateway: ImazuGateway, data: dict[str, Any]
+) -> list[WallPadDevice]:
+    """Return the devices of a gateway matching every given filter."""
+    device_types = {
+        POWER_DEVICES[name] for name in data.get(ATTR_DEVICE_TYPE, POWER_DEVICES)
+    }
+    room_id = data.get(ATTR_ROOM_ID)
+    entity_ids = data.get(ATTR_ENTITY_ID)
+    devices = []
+    for platform in _POWER_PLATFORMS:
+        for entity_data in gateway.get_platform_entities(platform):
+            device, packet = entity_data.device, entity_data.packet
+            if device is None or device.hass is None:
+                continue
+            if packet.device not in device_types:
+                continue
+            if room_id is not None and packet.room_id != room_id:
+                continue
+            if entity_ids is not None and device.entity_id not in entity_ids:
+                continue
+            devices.append(device)
+    return devices
+
+
+@callback
+def _async_get_thermostats(hass: HomeAssistant) -> dict[str, WPClimate]:
+    """Return the thermostats of every gateway by entity id."""
+    return {
+        entity_data.device.entity_id: entity_data.device
+        for gateway in _async_get_gateways(hass)
+        for entity_data in gateway.get_platform_entities(Platform.CLIMATE)
+        if entity_data.device is not None and entity_data.device.hass is not None
+    }
+
+
+async def _async_program_thermostat(
+    thermostat: WPClimate, preset_mode: str | None, temperature: int | None
+) -> str:
+    """Change what differs from the program, return the result of the room."""
+    set_mode = preset_mode is not None and not (
+        thermostat.state_confirmed and thermostat.preset_mode == preset_mode
+    )
+    set_temperature = temperature is not None and not (
+        thermostat.state_confirmed and thermostat.target_temperature == temperature
+    )
+    if not set_mode and not set_temperature:
+        return "skipped"
+    # The commands of one thermostat go out one after the other anyway.
+    if set_mode:
+        await thermostat.async_set_preset_mode(preset_mode)
+    if set_temperature:
+        await thermostat.async_set_temperature(**{ATTR_TEMPERATURE: temperature})
+    if not thermostat.state_confirmed:
+        return "failed"
+    if preset_mode is not None and thermostat.preset_mode != preset_mode:
+        return "failed"
+    if temperature is not None and thermostat.target_temperature != temperature:
+        return "failed"
+    return "changed"
+
+
+def _capture_path(hass: HomeAssistant, filename: str) -> Path:
+    """Return the path of a capture file in the config directory."""
+    if not filename.endswith(CAPTURE_SUFFIX):
+        filename += CAPTURE_SUFFIX
+    return Path(hass.config.path(DOMAIN, filename))
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Set up the services of the Imazu Wall Pad integration."""
+
+    async def async_rescan(call: ServiceCall) -> None:
+        """Scan again for devices that never answered."""
+        await asyncio.gather(
+            *(
+                gateway.async_discover(rescan=True)
+                for gateway in _async_get_gateways(hass)
+            )
+        )
+
+    async def async_start_capture(call: ServiceCall) -> None:
+        """Capture the received frames of every gateway to a file."""
+        name = call.data.get(ATTR_FILENAME)
+        if name is None:
+            name = dt_util.now().strftime("%Y%m%d_%H%M%S")
+        for gateway in _async_get_gateways(hass):
+            path = _capture_path(hass, f"{gateway.host}_{name}")
+            try:
+                await gateway.async_start_capture(path)
+            except FileExistsError as ex:
+                raise ServiceValidationError(f"Capture already exists: {path}") from ex
+
+    async def async_stop_capture(call: ServiceCall) -> None:
+        """Stop capturing the received frames."""
+        for gateway in _async_get_gateways(hass):
+            await gateway.async_stop_capture()
+
+    async def async_replay_capture(call: ServiceCall) -> ServiceResponse:
+        """Feed a capture file to every gateway as if it was received."""
+        path = _capture_path(hass, call.data[ATTR_FILENAME])
+        if not await hass.async_add_executor_job(path.is_file):
+            raise ServiceValidationError(f"Capture not found: {path}")
+        response = {}
+        for gateway in _async_get_gateways(hass):
+            started = time.monotonic()
+            try:
+                frames = await gateway.async_replay(path, call.data[ATTR_REALTIME])
+            except ValueError as ex:
+                raise ServiceValidationError(f"Invalid capture: {ex}") from ex
+            response[gateway.host] = {
+                "frames": frames,
+                "seconds": round(time.monotonic() - started, 3),
+            }
+        return response
+
+    async def async_set_power(call: ServiceCall) -> ServiceResponse:
+        """Turn the matching devices on or off in one burst.
+
+        There is no frame changing a whole room, so the commands of every
+        device are queued at once and overlap on the bus, room after room.
+        Devices already reporting the requested power are skipped.
+        """
+        power = call.data[ATTR_POWER]
+        devices = [
+            device
+            for gateway in _async_get_gateways(hass)
+            for device in _async_get_power_devices(gateway, call.data)
+        ]
+        pending = sorted(
+            (
+                device
+                for device in devices
+                if not (device.state_confirmed and device.is_on == power)
+            ),
+            key=lambda device: (device.packet.room_id, device.packet.sub_id),
+        )
+        started = time.monotonic()
+        results = await asyncio.gather(
+            *(
+                device.async_turn_on() if power else device.async_turn_off()
+                for device in pending
+            ),
+            return_exceptions=True,
+        )
+        failed = [
+            device.entity_id
+            for device, result in zip(pending, results)
+            if isinstance(result, Exception)
+            or not (device.state_confirmed and device.is_on == power)
+        ]
+        return {
+            "devices": len(devices),
+            "skipped": len(devices) - len(pending),
+            "changed": len(pending) - len(failed),
+            "failed": failed,
+            "seconds": round(time.monotonic() - started, 3),
+        }
+
+    async def async_set_heating(call: ServiceCall) -> ServiceResponse:
+        """Apply a heating program to every given room at once.
+
+        The rooms are programmed together so their commands overlap on the
+        bus, ahead of any poll. A room already in its target state is skipped.
+        """
+        thermostats = _async_get_thermostats(hass)
+        rooms = call.data[ATTR_ROOMS]
+        if unknown := [
+            room[ATTR_ENTITY_ID]
+            for room in rooms
+            if room[ATTR_ENTITY_ID] not in thermostats
+        ]:
+            raise ServiceValidationError(f"Unknown thermostats: {', '.join(unknown)}")
+        started = time.monotonic()
+        results = await asyncio.gather(
+            *(
+                _async_program_thermostat(
+                    thermostats[room[ATTR_ENTITY_ID]],
+                    room.get(ATTR_PRESET_MODE),
+                    room.get(ATTR_TEMPERATURE),
+                )
+                for room in rooms
+            ),
+            return_exceptions=True,
+        )
+        return {
+            "rooms": {
+                room[ATTR_ENTITY_ID]: (
+                    "failed" if isinstance(result, Exception) else result
+                )
+                for room, result in zip(rooms, results)
+            },
+            "seconds": round(time.monotonic() - started, 3),
+        }
+
+    hass.services.async_register(DOMAIN, SERVICE_RESCAN, async_rescan)
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_START_CAPTURE,
+        async_start_capture,
+        schema=START_CAPTURE_SCHEMA,
+    )
+    hass.services.async_register(DOMAIN, SERVICE_STOP_CAPTURE, async_stop_capture)
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_REPLAY_CAPTURE,
+        async_replay_capture,
+        schema=REPLAY_CAPTURE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_SET_POWER,
+        async_set_power,
+        schema=SET_POWER_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_SET_HEATING,
+        async_set_heating,
+        schema=SET_HEATING_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
@@ -11,21 +11,13 @@ from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from . import ImazuGateway, ImazuWallPadConfigEntry
+from .const import SCAN_SWITCH_PACKETS
 from .gateway import EntityData
+from .transmit import Priority
 from .wall_pad import WallPadDevice
 
 _LOGGER = logging.getLogger(__name__)
 
-SCAN_SWITCH_PACKETS = [
-    "011f0140100000",
-    "011f0140200000",
-    "011f0140300000",
-    "011f0140400000",
-    "011f0140500000",
-    "011f0140600000",
-    "011b0143110000",
-]
-
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -36,29 +28,32 @@ async def async_setup_entry(
     gateway: ImazuGateway = entry.runtime_data
 
     @callback
-    def async_add_entity(entity_data: EntityData):
-        if isinstance(entity_data.packet, OutletPacket):
-            entity_data.device = WPOutlet(gateway, Platform.SWITCH, entity_data.packet)
-            async_add_entities([entity_data.device])
-        elif isinstance(entity_data.packet, GasPacket):
-            entity_data.device = WPGasValve(
-                gateway, Platform.SWITCH, entity_data.packet
-            )
-            async_add_entities([entity_data.device])
+    def async_add_entity(entities: list[EntityData]):
+        devices = []
+        for entity_data in entities:
+            if isinstance(entity_data.packet, OutletPacket):
+                entity_data.device = WPOutlet(
+                    gateway, Platform.SWITCH, entity_data.packet
+                )
+            elif isinstance(entity_data.packet, GasPacket):
+                entity_data.device = WPGasValve(
+                    gateway, Platform.SWITCH, entity_data.packet
+                )
+            else:
+                continue
+            devices.append(entity_data.device)
+        if devices:
+            async_add_entities(devices)
 
     entities = gateway.get_platform_entities(Platform.SWITCH)
-    for data in entities:
-        async_add_entity(data)
+    async_add_entity(entities)
 
     entry.async_on_unload(
         async_dispatcher_connect(
             hass, gateway.entity_add_signal(Platform.SWITCH), async_add_entity
         )
     )
-
-    if len(entities) == 0:
-        for packet in SCAN_SWITCH_PACKETS:
-            await gateway.async_send(bytes.fromhex(packet))
+    gateway.async_add_scan_packets(SCAN_SWITCH_PACKETS)
 
 
 class WPOutlet(WallPadDevice[OutletPacket], SwitchEntity):
@@ -74,17 +69,21 @@ class WPOutlet(WallPadDevice[OutletPacket], SwitchEntity):
     @property
     def is_on(self) -> bool:
         """Return true if switch is on."""
-        return self.packet.state["power"] == OutletPacket.Power.ON
+        return self.packet_state["power"] == OutletPacket.Power.ON
 
     async def async_turn_on(self, **kwargs: Any) -> None:
         """Turn on switch."""
         make_packet = self.packet.make_change_power(OutletPacket.Power.ON)
-        await super().async_send_packet(make_packet)
+        await super().async_send_packet(
+            make_packet, expected_state={"power": OutletPacket.Power.ON}
+        )
 
     async def async_turn_off(self, **kwargs: Any) -> None:
         """Turn off switch."""
         make_packet = self.packet.make_change_power(OutletPacket.Power.OFF)
-        await super().async_send_packet(make_packet)
+        await super().async_send_packet(
+            make_packet, expected_state={"power": OutletPacket.Power.OFF}
+        )
 
 
 class WPGasValve(WallPadDevice[GasPacket], SwitchEntity):
@@ -98,7 +97,7 @@ class WPGasValve(WallPadDevice[GasPacket], SwitchEntity):
     @property
     def is_on(self) -> bool:
         """Return true if gas valve is open."""
-        return self.packet.state["valve"] == GasPacket.Valve.OPEN
+        return self.packet_state["valve"] == GasPacket.Valve.OPEN
 
     async def async_turn_on(self, **kwargs: Any) -> None:
         """Can not be opened remotely."""
@@ -107,7 +106,7 @@ class WPGasValve(WallPadDevice[GasPacket], SwitchEntity):
     async def async_turn_off(self, **kwargs: Any) -> None:
         """Turn off gas valve."""
         make_packet = self.packet.make_change_valve_close()
-        await super().async_send_packet(make_packet)
+        await super().async_send_packet(make_packet, Priority.SAFETY)
 
     @property
     def icon(self) -> str:
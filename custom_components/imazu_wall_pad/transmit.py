@@ -0,0 +1,337 @@
+"""Transmit scheduler of Wall Pad."""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+import logging
+import time
+from collections import deque
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from enum import IntEnum
+
+from wp_imazu.packet import ImazuPacket, ValueType
+
+from .client import ImazuWallPadClient
+from .frame import FrameRing
+from .metrics import BusMetrics
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class Priority(IntEnum):
+    """Transmit priority, lower values are sent first."""
+
+    SAFETY = 0
+    COMMAND = 1
+    DISCOVERY = 2
+    POLL = 3
+
+
+# Seconds to wait for the status packet answering a command
+REQUEST_TIMEOUT = 1.5
+REQUEST_RETRY_COUNT = 2
+# Seconds before the first retry, doubled for every further retry
+REQUEST_RETRY_BACKOFF = 0.5
+# Commands waiting for an answer at the same time
+MAX_IN_FLIGHT = 4
+# Seconds a partial frame keeps the bus busy, unless more bytes arrive
+PARTIAL_FRAME_TIMEOUT = 0.2
+
+
+def _request_key(packet: bytes) -> str:
+    """Return the packet id of the device a command is sent to."""
+    # 01 or 1a, device, cmd, value_type, sub, change_value, state_value
+    return f"{packet[1]:02x}_{packet[4]:02x}"
+
+
+@dataclass
+class _Request:
+    """A command waiting for the status packet answering it."""
+
+    packet: bytes
+    priority: Priority
+    future: asyncio.Future[bool]
+    attempt: int = 0
+    sent: float = 0.0
+    slot: bool = False
+    timer: asyncio.TimerHandle | None = None
+
+
+@dataclass(order=True)
+class _TransmitItem:
+    """A packet waiting for the bus."""
+
+    priority: Priority
+    seq: int
+    packet: bytes = field(compare=False)
+    future: asyncio.Future[None] | None = field(compare=False)
+    request: _Request | None = field(compare=False, default=None)
+
+
+class TransmitScheduler:
+    """Hands packets to the client one at a time, most urgent first.
+
+    The client paces the frames it writes, so the scheduler only decides
+    which packet goes next and never lets the client queue grow. Commands do
+    not hold the bus while waiting for their answer: they are matched to the
+    status packets as those arrive, so commands to different devices overlap.
+    The bus is half duplex, so a packet waits for an idle gap after the last
+    byte seen on the wire rather than cutting into a burst of the wall pad.
+    """
+
+    def __init__(
+        self,
+        client: ImazuWallPadClient,
+        metrics: BusMetrics,
+        history: FrameRing,
+        on_send_wait: Callable[[bytes], None],
+        idle_gap: float,
+    ) -> None:
+        """Initialize the transmit scheduler."""
+        self._client = client
+        self._metrics = metrics
+        self._history = history
+        self._on_send_wait = on_send_wait
+        self._idle_gap = idle_gap
+        self._last_activity = 0.0
+        self._partial_frame = False
+        self.last_sent = 0.0
+        self._queue: asyncio.PriorityQueue[_TransmitItem] = asyncio.PriorityQueue()
+        self._seq = itertools.count()
+        self._requests: dict[str, _Request] = {}
+        self._free_slots = MAX_IN_FLIGHT
+        self._waiting: deque[_Request] = deque()
+        self._connected = asyncio.Event()
+
+    @property
+    def queue_size(self) -> int:
+        """Return the number of packets waiting for the bus."""
+        return self._queue.qsize()
+
+    @property
+    def in_flight(self) -> int:
+        """Return the number of commands waiting for an answer."""
+        return len(self._requests)
+
+    def bus_activity(self, now: float, partial_frame: bool) -> None:
+        """Note bytes seen on the wire, partial_frame if a frame is unfinished."""
+        self._last_activity = now
+        self._partial_frame = partial_frame
+
+    def _idle_wait(self, now: float) -> float:
+        """Return the seconds until the bus has been idle for the gap.
+
+        The send interval of the client is waited out here as well, its writer
+        gives up on a frame instead of waiting for both intervals in turn.
+        """
+        gap = self._idle_gap
+        if self._partial_frame:
+            gap = max(gap, PARTIAL_FRAME_TIMEOUT)
+        return max(
+            max(self._last_activity, self.last_sent) + gap,
+            self.last_sent + self._client.send_interval,
+        ) - now
+
+    async def _async_wait_idle(self) -> None:
+        """Wait until nothing was seen on the wire for the idle gap."""
+        while (delay := self._idle_wait(time.monotonic())) > 0:
+            await asyncio.sleep(delay)
+
+    async def _async_write(self, packet: bytes) -> bool:
+        """Write a packet to the bus once it is idle, return False if not written."""
+        if (frame := self._client.make_frame(packet)) is None:
+            return False
+        await self._async_wait_idle()
+        if not await self._client.async_send_frame(frame):
+            return False
+        self._history.append(frame, True)
+        self.last_sent = time.monotonic()
+        self._metrics.frame_sent(frame)
+        return True
+
+    def _put(
+        self,
+        packet: bytes,
+        priority: Priority,
+        future: asyncio.Future[None] | None,
+        request: _Request | None = None,
+    ) -> None:
+        """Put a packet on the queue."""
+        self._queue.put_nowait(
+            _TransmitItem(priority, next(self._seq), packet, future, request)
+        )
+
+    def queue(self, packet: bytes, priority: Priority) -> None:
+        """Queue a packet without waiting for it to be sent."""
+        self._put(packet, priority, None)
+
+    async def async_send(self, packet: bytes, priority: Priority) -> None:
+        """Queue a packet and wait until it is sent.
+
+        Raises ConnectionError if the packet could not be sent.
+        """
+        future = asyncio.get_running_loop().create_future()
+        self._put(packet, priority, future)
+        await future
+
+    async def async_request(self, packet: bytes, priority: Priority) -> bool:
+        """Queue a command and wait for its answer, return False if none came."""
+        if not self._connected.is_set():
+            _LOGGER.warning("Not connected, drop packet: %s", packet.hex())
+            return False
+        request = _Request(
+            packet, priority, asyncio.get_running_loop().create_future()
+        )
+        self._put(packet, priority, None, request)
+        return await request.future
+
+    def packet_received(self, packet: ImazuPacket) -> None:
+        """Complete the command a status packet answers."""
+        if (request := self._requests.get(packet.packet_id)) is None:
+            return
+        # The answer repeats the change value of the command, a report does not.
+        # Fans answer with a multi status packet, its change value is always 00.
+        if (
+            packet.change_value != f"{request.packet[5]:02x}"
+            and packet.value_type != ValueType.MULTI
+        ):
+            return
+        self._metrics.round_trip(time.monotonic() - request.sent)
+        self._finish(request, True)
+
+    def _finish(self, request: _Request, result: bool) -> None:
+        """Complete a command and free its slot."""
+        if request.timer is not None:
+            request.timer.cancel()
+            request.timer = None
+        key = _request_key(request.packet)
+        if self._requests.get(key) is request:
+            del self._requests[key]
+        if request.slot:
+            request.slot = False
+            self._free_slots += 1
+            self._resume_waiting()
+        if not request.future.done():
+            request.future.set_result(result)
+
+    def _resume_waiting(self) -> None:
+        """Hand free slots to the commands waiting for one, in order."""
+        while self._free_slots and self._waiting:
+            request = self._waiting.popleft()
+            if request.future.done():
+                continue
+            self._free_slots -= 1
+            request.slot = True
+            self._put(request.packet, request.priority, None, request)
+
+    def _timeout(self, request: _Request) -> None:
+        """Retry a command that got no answer, after a growing delay."""
+        request.timer = None
+        if request.attempt > REQUEST_RETRY_COUNT:
+            _LOGGER.warning("No answer to %s", request.packet.hex())
+            self._finish(request, False)
+            return
+        self._metrics.retries += 1
+        delay = REQUEST_RETRY_BACKOFF * 2 ** (request.attempt - 1)
+        request.timer = asyncio.get_running_loop().call_later(
+            delay, self._put, request.packet, request.priority, None, request
+        )
+
+    def cancel_requests(self) -> None:
+        """Fail every command still waiting for an answer or for a slot."""
+        while self._waiting:
+            self._finish(self._waiting.popleft(), False)
+        for request in list(self._requests.values()):
+            self._finish(request, False)
+
+    def set_connected(self, connected: bool) -> None:
+        """Hold the queue while disconnected, failing what is waiting."""
+        if connected:
+            self._connected.set()
+            return
+        self._connected.clear()
+        self.cancel_requests()
+        dropped = 0
+        while not self._queue.empty():
+            item = self._queue.get_nowait()
+            dropped += 1
+            if item.request is not None:
+                self._finish(item.request, False)
+            elif item.future is not None and not item.future.done():
+                item.future.set_exception(ConnectionError("Not connected"))
+        if dropped:
+            _LOGGER.debug("Not connected, dropped %d queued packets", dropped)
+
+    def _arm_timeout(self, request: _Request) -> None:
+        """Start waiting for the answer to a command from now on."""
+        if request.timer is not None:
+            request.timer.cancel()
+        request.sent = time.monotonic()
+        request.timer = asyncio.get_running_loop().call_later(
+            REQUEST_TIMEOUT, self._timeout, request
+        )
+
+    async def _async_send_request(self, request: _Request) -> None:
+        """Send a command and wait for its answer in the background.
+
+        A command without a slot waits aside for one instead of holding up
+        the queue, as the retries freeing the slots go through it as well.
+        """
+        if not request.slot:
+            if not self._free_slots:
+                self._waiting.append(request)
+                return
+            self._free_slots -= 1
+            request.slot = True
+        key = _request_key(request.packet)
+        if (other := self._requests.get(key)) is not None and other is not request:
+            self._finish(other, False)
+        self._requests[key] = request
+        self._on_send_wait(request.packet)
+        request.attempt += 1
+        # The answer is awaited even if the write never completes.
+        self._arm_timeout(request)
+        await self._async_write(request.packet)
+        if not request.future.done():
+            self._arm_timeout(request)
+
+    async def async_run(self) -> None:
+        """Send queued packets until cancelled."""
+        while True:
+            await self._connected.wait()
+            item = await self._queue.get()
+            request = item.request
+            if request is not None and request.future.done():
+                # Abandoned by its caller, it may still hold a slot.
+                self._finish(request, False)
+                continue
+            try:
+                if not self._client.connected:
+                    _LOGGER.warning("Not connected, drop packet: %s", item.packet.hex())
+                    if request is not None:
+                        self._finish(request, False)
+                    elif item.future is not None and not item.future.done():
+                        item.future.set_exception(ConnectionError("Not connected"))
+                elif request is not None:
+                    await self._async_send_request(request)
+                elif not await self._async_write(item.packet):
+                    raise ConnectionError(f"Not written: {item.packet.hex()}")
+            except asyncio.CancelledError:
+                if request is not None:
+                    self._finish(request, False)
+                elif item.future is not None and not item.future.done():
+                    item.future.set_result(None)
+                raise
+            except Exception as ex:  # pylint: disable=broad-except
+                if request is not None:
+                    _LOGGER.error("send error, %s, %s", ex, item.packet.hex())
+                    self._finish(request, False)
+                elif item.future is None:
+                    _LOGGER.error("send error, %s, %s", ex, item.packet.hex())
+                elif not item.future.done():
+                    item.future.set_exception(ex)
+            else:
+                if item.future is not None and not item.future.done():
+                    item.future.set_result(None)
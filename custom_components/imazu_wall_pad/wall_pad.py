@@ -1,17 +1,18 @@
 """Wall Pad device class."""
 
 import logging
-from datetime import timedelta
-from typing import Generic, TypeVar
+import time
+from datetime import datetime
+from typing import Any, Generic, TypeVar
 
 from wp_imazu.packet import ImazuPacket
 
 from homeassistant.const import Platform
-from homeassistant.core import callback
+from homeassistant.core import CALLBACK_TYPE, callback
 from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity import DeviceInfo
+from homeassistant.helpers.event import async_call_later
 from homeassistant.helpers.restore_state import RestoredExtraData, RestoreEntity
-from homeassistant.util import Throttle
 from . import ImazuGateway
 from .const import (
     ATTR_DEVICE,
@@ -25,23 +26,33 @@ from .const import (
     SW_VERSION,
 )
 from .helper import host_to_last
+from .transmit import Priority
 
 _LOGGER = logging.getLogger(__name__)
 
 T = TypeVar("T", bound=ImazuPacket)
 
-MIN_TIME_BETWEEN_UPDATES = timedelta(seconds=90)
+# Seconds an optimistic state waits for its status packet before rolling back
+OPTIMISTIC_TIMEOUT = 10
 
 
 class WallPadDevice(Generic[T], RestoreEntity):
     """Defines a Wall Pad Device entity."""
 
-    _attr_should_poll = True
+    _attr_should_poll = False
+    # State keys that change often by small steps, their changes are coalesced
+    # and those within the deadband written only once they last
+    _state_deadbands: dict[str, float] = {}
 
     def __init__(self, gateway: ImazuGateway, platform: Platform, packet: T) -> None:
         """Initialize the instance."""
         self.gateway = gateway
         self.packet = packet
+        self._expected_state: dict[str, Any] | None = None
+        self._rollback_unsub: CALLBACK_TYPE | None = None
+        self._written_state: dict[str, Any] = {}
+        self._last_write = 0.0
+        self._write_unsub: CALLBACK_TYPE | None = None
         self.entity_id = (
             f"{str(platform.value)}."
             f"{BRAND_NAME}_{host_to_last(self.gateway.host)}_"
@@ -67,14 +78,147 @@ class WallPadDevice(Generic[T], RestoreEntity):
             ATTR_SUB_ID: self.packet.sub_id,
         }
 
+    @callback
+    def _async_update_available(self, connected: bool) -> None:
+        """Cache whether the device can be used, as it only changes with events."""
+        self._attr_available = connected and bool(self.packet.state)
+
+    def _is_minor_change(self, state: dict[str, Any]) -> bool | None:
+        """Return if a state changes only keys with a deadband, None if not at all."""
+        changed = {
+            key
+            for key in state.keys() | self._written_state.keys()
+            if state.get(key) != self._written_state.get(key)
+        }
+        if not changed:
+            return None
+        if not changed <= self._state_deadbands.keys():
+            return False
+        if any(key not in state or key not in self._written_state for key in changed):
+            return False
+        return True
+
+    def _is_within_deadband(self, state: dict[str, Any]) -> bool:
+        """Return True if a minor change stays within every deadband."""
+        return all(
+            abs(state[key] - self._written_state[key]) <= deadband
+            for key, deadband in self._state_deadbands.items()
+            if key in state and key in self._written_state
+        )
+
+    @callback
+    def _async_write_packet_state(self, now: datetime | None = None) -> None:
+        """Write the reported state now."""
+        self._async_cancel_write()
+        self._written_state = self.packet.state
+        self._last_write = time.monotonic()
+        self.async_write_ha_state()
+
+    @callback
+    def _async_schedule_write(self) -> None:
+        """Write the reported state, coalescing minor changes.
+
+        Minor changes are written at most once per write interval, any other
+        change right away along with the minor changes waiting for it. A change
+        within the deadband is written only once it lasted a whole interval, a
+        flicker back to the written state drops it.
+        """
+        if (minor := self._is_minor_change(self.packet.state)) is None:
+            self._async_cancel_write()
+            return
+        if minor:
+            if self._is_within_deadband(self.packet.state):
+                delay = float(self.gateway.write_interval)
+            else:
+                delay = (
+                    self._last_write + self.gateway.write_interval - time.monotonic()
+                )
+            if delay > 0:
+                if self._write_unsub is None:
+                    self._write_unsub = async_call_later(
+                        self.hass, delay, self._async_write_packet_state
+                    )
+                return
+        self._async_write_packet_state()
+
+    @callback
+    def _async_cancel_write(self) -> None:
+        """Cancel the pending write."""
+        if self._write_unsub is not None:
+            self._write_unsub()
+            self._write_unsub = None
+
     @property
-    def available(self):
-        """Return True if device is available."""
-        return self.gateway.connected and self.packet.state
+    def packet_state(self) -> dict[str, Any]:
+        """Return the device state, including a state not confirmed yet."""
+        if self._expected_state is None:
+            return self.packet.state
+        return {**self.packet.state, **self._expected_state}
 
-    async def async_send_packet(self, packet: bytes):
-        """Send a packet to the client."""
-        await self.gateway.async_send_wait(packet)
+    @property
+    def state_confirmed(self) -> bool:
+        """Return True if the device reported the state it shows."""
+        return self._expected_state is None
+
+    async def async_send_packet(
+        self,
+        packet: bytes,
+        priority: Priority = Priority.COMMAND,
+        expected_state: dict[str, Any] | None = None,
+    ):
+        """Send a packet to the client.
+
+        In optimistic mode the expected state is shown right away and kept
+        until a status packet confirms it or the timeout rolls it back.
+        """
+        if expected_state and self.gateway.optimistic and self.gateway.connected:
+            self._async_set_expected_state(expected_state)
+        try:
+            await self.gateway.async_send_wait(packet, priority)
+        except Exception:
+            self._async_rollback()
+            raise
+
+    def _is_confirmed(self, state: dict[str, Any]) -> bool:
+        """Return True if a device state matches the expected state."""
+        assert self._expected_state is not None
+        return all(
+            state.get(key) == value for key, value in self._expected_state.items()
+        )
+
+    @callback
+    def _async_set_expected_state(self, expected_state: dict[str, Any]) -> None:
+        """Show the expected state until it is confirmed."""
+        self._async_cancel_rollback()
+        self._expected_state = expected_state
+        if self._is_confirmed(self.packet.state):
+            self._expected_state = None
+            return
+        self._rollback_unsub = async_call_later(
+            self.hass, OPTIMISTIC_TIMEOUT, self._async_rollback
+        )
+        self.async_write_ha_state()
+
+    @callback
+    def _async_cancel_rollback(self) -> None:
+        """Cancel the pending rollback."""
+        if self._rollback_unsub is not None:
+            self._rollback_unsub()
+            self._rollback_unsub = None
+
+    @callback
+    def _async_rollback(self, now: datetime | None = None) -> None:
+        """Show the last reported state again and ask the device for it."""
+        self._rollback_unsub = None
+        if self._expected_state is None:
+            return
+        _LOGGER.debug(
+            "%s did not confirm %s, rolling back", self.entity_id, self._expected_state
+        )
+        self._expected_state = None
+        self.async_write_ha_state()
+        if make_packet := self.packet.make_scan():
+            self.gateway.async_queue(make_packet, Priority.POLL)
 
     async def async_added_to_hass(self) -> None:
         """Register state update callback."""
@@ -82,26 +226,42 @@ class WallPadDevice(Generic[T], RestoreEntity):
         @callback
         def async_update_packet(packet: ImazuPacket) -> None:
             """Handle packet updates."""
+            if self._expected_state is not None:
+                self.packet = packet
+                self._async_update_available(self.gateway.connected)
+                if self._is_confirmed(packet.state):
+                    self._async_cancel_rollback()
+                    self._expected_state = None
+                    self._async_write_packet_state()
+                return
             if self.packet.state == packet.state:
                 return
             self.packet = packet
-            self.async_write_ha_state()
+            self._async_update_available(self.gateway.connected)
+            self._async_schedule_write()
 
+        @callback
+        def async_update_connection(connected: bool) -> None:
+            """Handle the link going up or down."""
+            self._async_update_available(connected)
+            self._async_write_packet_state()
+
+        self.async_on_remove(
+            self.gateway.async_register_device(
+                self.packet.device_id, async_update_packet
+            )
+        )
         self.async_on_remove(
             async_dispatcher_connect(
-                self.hass,
-                f"{DOMAIN}_{self.gateway.host}_{self.packet.device_id}",
-                async_update_packet,
+                self.hass, self.gateway.connection_signal, async_update_connection
             )
         )
+        self._async_update_available(self.gateway.connected)
+        self._written_state = self.packet.state
+        self.async_on_remove(self._async_cancel_rollback)
+        self.async_on_remove(self._async_cancel_write)
 
     @property
     def extra_restore_state_data(self) -> RestoredExtraData:
         """Return entity specific state data to be restored."""
         return RestoredExtraData({PACKET: self.packet.hex()})
-
-    @Throttle(MIN_TIME_BETWEEN_UPDATES)
-    async def async_update(self) -> None:
-        """Update device."""
-        make_packet = self.packet.make_scan()
-        await self.gateway.async_send(make_packet)